@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Niezmienna kopia danych użytkownika przechowywana w pamięci podręcznej."""
+
+    id: int
+    email: str
+    username: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserSnapshot":
+        """Tworzy migawkę na podstawie obiektu ORM użytkownika."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            is_active=user.is_active,
+        )
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """Wpis pamięci podręcznej: zdekodowane dane tokenu i migawka użytkownika."""
+
+    claims: Dict[str, Any]
+    user: UserSnapshot
+    expires_at: float
+
+
+class TokenCache:
+    """
+    Ograniczona pamięć podręczna LRU z czasem życia (TTL) dla tokenów JWT.
+
+    Czas życia wpisu jest dodatkowo ograniczony przez pole `exp` tokenu,
+    więc wygasły token nigdy nie zostanie zwrócony z pamięci podręcznej.
+    Klasa jest bezpieczna wątkowo, ponieważ zależności synchroniczne
+    FastAPI wykonywane są w puli wątków.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        """
+        Zwraca wpis dla tokenu, jeśli istnieje i nie wygasł.
+
+        Args:
+            token: Token JWT.
+
+        Returns:
+            Wpis pamięci podręcznej lub None.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def set(self, token: str, claims: Dict[str, Any], user: UserSnapshot) -> None:
+        """
+        Zapisuje zweryfikowany token wraz z migawką użytkownika.
+
+        Args:
+            token: Token JWT.
+            claims: Zdekodowane dane tokenu.
+            user: Migawka użytkownika.
+        """
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        token_exp = claims.get("exp")
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = CachedToken(claims, user, expires_at)
+            self._tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Usuwa wszystkie wpisy należące do podanego użytkownika.
+
+        Args:
+            user_id: Identyfikator użytkownika.
+        """
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy i zeruje liczniki."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Zwraca liczniki trafień i chybień oraz rozmiar pamięci podręcznej."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+    def _remove(self, token: str) -> None:
+        # Wywoływane wyłącznie z założoną blokadą
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry.user.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry.user.id]
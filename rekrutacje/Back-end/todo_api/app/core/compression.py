@@ -0,0 +1,229 @@
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli jest zależnością opcjonalną
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard jest zależnością opcjonalną
+    zstandard = None
+
+# Typy treści, dla których kompresja się opłaca
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+
+class GzipEncoder:
+    """Koder gzip z biblioteki standardowej."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        # Z_SYNC_FLUSH wysyła dotychczasowe dane bez kończenia strumienia
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Koder brotli (wymaga pakietu `brotli`)."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    """Koder zstd (wymaga pakietu `zstandard`)."""
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders(
+    gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3
+) -> Dict[str, Callable[[], object]]:
+    """
+    Zwraca fabryki koderów dostępnych w środowisku, od najbardziej preferowanego.
+
+    Args:
+        gzip_level: Poziom kompresji gzip (1-9).
+        brotli_quality: Jakość kompresji brotli (0-11).
+        zstd_level: Poziom kompresji zstd (1-22).
+
+    Returns:
+        Słownik kodowanie -> funkcja tworząca nowy koder.
+    """
+    encoders: Dict[str, Callable[[], object]] = {}
+    if zstandard is not None:
+        encoders["zstd"] = lambda: ZstdEncoder(zstd_level)
+    if brotli is not None:
+        encoders["br"] = lambda: BrotliEncoder(brotli_quality)
+    encoders["gzip"] = lambda: GzipEncoder(gzip_level)
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """
+    Wybiera kodowanie na podstawie nagłówka Accept-Encoding.
+
+    Wygrywa kodowanie o najwyższej wadze `q`; przy równych wagach decyduje
+    kolejność `supported`. Wartość `*` dotyczy kodowań niewymienionych wprost.
+
+    Args:
+        accept_encoding: Wartość nagłówka Accept-Encoding.
+        supported: Obsługiwane kodowania w kolejności preferencji serwera.
+
+    Returns:
+        Wybrane kodowanie lub None, jeśli odpowiedź ma zostać bez kompresji.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+
+    best: Optional[Tuple[float, int]] = None
+    chosen = None
+    for position, encoding in enumerate(supported):
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or (weight, -position) > best):
+            best = (weight, -position)
+            chosen = encoding
+    return chosen
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI kompresujące odpowiedzi zgodnie z Accept-Encoding.
+
+    Odpowiedzi mniejsze niż `minimum_size` oraz typy treści spoza
+    `COMPRESSIBLE_TYPES` wysyłane są bez zmian. Odpowiedzi strumieniowane
+    kompresowane są porcja po porcji (z opróżnieniem kodera po każdej),
+    więc klient otrzymuje dane od razu.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = available_encoders(gzip_level, brotli_quality, zstd_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, list(self.encoders))
+        if scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                compressible = headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                if "content-encoding" in headers or not compressible:
+                    passthrough = True
+                    await send(message)
+                    return
+                if encoding is None:
+                    # Treść zależy od Accept-Encoding także bez kompresji
+                    passthrough = True
+                    headers = MutableHeaders(raw=list(message.get("headers", [])))
+                    headers.add_vary_header("Accept-Encoding")
+                    await send({**message, "headers": headers.raw})
+                    return
+                # Nagłówki wysyłane są razem z pierwszą porcją treści
+                start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    # Mała odpowiedź: koszt kompresji większy niż zysk
+                    await send({**start_message, "headers": headers.raw})
+                    await send(message)
+                    start_message = None
+                    passthrough = True
+                    return
+
+                encoder = self.encoders[encoding]()
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                    data = encoder.compress(body) + encoder.flush()
+                else:
+                    data = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(data))
+                await send({**start_message, "headers": headers.raw})
+                start_message = None
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            if more_body:
+                data = encoder.compress(body) + encoder.flush()
+            else:
+                data = encoder.compress(body) + encoder.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
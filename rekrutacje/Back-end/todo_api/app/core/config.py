@@ -1,22 +1,214 @@
+import json
+import logging
+import os
 import secrets
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseSettings, validator
 
+logger = logging.getLogger(__name__)
 
-class Settings(BaseModel):
-    """Klasa przechowująca ustawienia aplikacji."""
+# Zmienna środowiskowa ze ścieżką do opcjonalnego pliku konfiguracji (JSON)
+CONFIG_FILE_ENV = "TODO_API_CONFIG_FILE"
+
+
+def json_config_settings_source(settings: BaseSettings) -> Dict[str, Any]:
+    """
+    Wczytuje ustawienia z pliku JSON wskazanego przez zmienną TODO_API_CONFIG_FILE.
+    
+    Args:
+        settings: Tworzony obiekt ustawień (wymagany przez interfejs pydantic).
+        
+    Returns:
+        Słownik ustawień z pliku lub pusty słownik, jeśli plik nie został wskazany.
+    """
+    path = os.environ.get(CONFIG_FILE_ENV)
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as config_file:
+        return json.load(config_file)
+
+
+class Settings(BaseSettings):
+    """
+    Klasa przechowująca ustawienia aplikacji.
+    
+    Wartości pobierane są kolejno ze zmiennych środowiskowych o nazwach pól
+    (np. `SECRET_KEY`, `DB_POOL_SIZE`; listy w formacie JSON), z pliku JSON
+    wskazanego przez `TODO_API_CONFIG_FILE` oraz z wartości domyślnych.
+    Wszystkie procesy i węzły korzystające z tych samych ustawień podpisują
+    i weryfikują tokeny tymi samymi kluczami.
+    """
     
     # Podstawowe ustawienia API
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "API Listy Zadań"
     
+    # Serwer produkcyjny (serve.py); 0 procesów roboczych oznacza liczbę rdzeni CPU
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None
+    
+    # Tworzenie tabel przy starcie aplikacji (serve.py wyłącza je w procesach roboczych)
+    INIT_DB_ON_STARTUP: bool = True
+    
     # Ustawienia bezpieczeństwa
-    SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Klucz podpisujący nowe tokeny; bez konfiguracji losowy (z ostrzeżeniem)
+    SECRET_KEY: str = ""
+    # Poprzednie klucze, nadal akceptowane przy weryfikacji (rotacja kluczy)
+    PREVIOUS_SECRET_KEYS: List[str] = []
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 dni
     
+    # Odczyt użytkownika przy każdym (niezbuforowanym) tokenie w endpointach zadań;
+    # domyślnie identyfikator i stan aktywności pochodzą z podpisanego tokenu
+    AUTH_VERIFY_USER_ON_REQUEST: bool = False
+    # Wiek tokenu (s), do którego dane użytkownika z tokenu są przyjmowane bez odczytu
+    # bazy; starsze tokeny weryfikowane są w bazie (i buforowane), więc usunięty
+    # lub dezaktywowany użytkownik traci dostęp najpóźniej po tym czasie
+    AUTH_CLAIMS_MAX_AGE_SECONDS: int = 300
+    
+    # Pamięć podręczna zweryfikowanych tokenów (0 wyłącza pamięć podręczną)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    
+    # Ograniczanie liczby żądań logowania i rejestracji (kubełki tokenów)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_IP_BURST: int = 20
+    RATE_LIMIT_IP_PER_MINUTE: float = 60
+    RATE_LIMIT_USERNAME_BURST: int = 5
+    RATE_LIMIT_USERNAME_PER_MINUTE: float = 10
+    # Adres klienta z nagłówka X-Forwarded-For (tylko za zaufanym serwerem proxy)
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    
+    # Hashowanie haseł: schemat nowych hashy ("bcrypt" lub "argon2" z pakietem
+    # argon2-cffi) i jego koszt; słabsze hashe są zastępowane przy logowaniu
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_ARGON2_MEMORY_KIB: int = 65536
+    PASSWORD_ARGON2_TIME_COST: int = 3
+    PASSWORD_ARGON2_PARALLELISM: int = 4
+    
+    # Pula wykonawców dla hashowania haseł ("thread" lub "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # Szybka serializacja list i pojedynczych zadań (krotki kolumn + orjson)
+    FAST_JSON_RESPONSES: bool = False
+    
+    # Maksymalna liczba pozycji w jednym żądaniu zbiorczym na zadaniach
+    BULK_MAX_ITEMS: int = 1000
+    
+    # Odstęp (s) okresowego uzgadniania liczników statystyk zadań z tabelą zadań
+    # (0 wyłącza); jednorazowe uzgodnienie wykonywane jest razem z init_db
+    TASK_STATS_RECONCILE_SECONDS: int = 0
+    
+    # Zapisy grupowe: pojedyncze zapisy zadań nadchodzące w oknie czasowym (ms)
+    # zatwierdzane są jedną transakcją (jeden fsync zamiast jednego na żądanie)
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_WINDOW_MS: float = 2.0
+    GROUP_COMMIT_MAX_BATCH: int = 64
+    
+    # Liczba wierszy pobieranych z kursora bazy na jedną porcję eksportu zadań
+    EXPORT_BATCH_SIZE: int = 500
+    
+    # Import zadań: wielkość transakcji, limit długości rekordu i liczby zgłaszanych błędów
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_LINE_BYTES: int = 64 * 1024
+    IMPORT_MAX_ERRORS: int = 1000
+    
+    # Metryki w formacie Prometheus (endpoint /metrics, czasy żądań i zapytań SQL).
+    # Z ustawionym METRICS_TOKEN endpoint wymaga nagłówka "Authorization: Bearer
+    # <token>", bez niego odpowiada tylko klientom z adresu lokalnego. Metryki są
+    # liczone osobno w każdym procesie roboczym, więc przy serve.py z kilkoma
+    # procesami kolejne odczyty trafiają do różnych procesów (do zbierania metryk
+    # należy uruchomić jeden proces roboczy)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+    
+    # Profiler SQL (tryb diagnostyczny): nagłówki X-DB-Queries i Server-Timing,
+    # logowanie wolnych zapytań i powtórzonych instrukcji (podejrzenie N+1)
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_SLOW_QUERY_MS: float = 100.0
+    SQL_N_PLUS_ONE_THRESHOLD: int = 3
+    
+    # Kompresja odpowiedzi (gzip, a jeśli zainstalowane także brotli i zstd)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
     # URL bazy danych
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./todo_app.db"
+    
+    # Profil połączenia SQLite (PRAGMA ustawiane przy każdym nowym połączeniu)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -20000  # wartość ujemna oznacza rozmiar w KiB
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    
+    # Pula połączeń z bazą danych
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    
+    # Osobna pula tylko do odczytu dla endpointów GET; bez adresu repliki
+    # odczyty trafiają do tego samego pliku SQLite otwartego w trybie `mode=ro`
+    DB_READ_ROUTING: bool = True
+    SQLALCHEMY_READ_DATABASE_URI: Optional[str] = None
+    SQLALCHEMY_ASYNC_READ_DATABASE_URI: Optional[str] = None
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_MAX_OVERFLOW: int = 10
+    
+    # Tryb asynchroniczny (create_async_engine, lokalnie aiosqlite)
+    ASYNC_DATABASE: bool = False
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None
+    
+    class Config:
+        case_sensitive = True
+        
+        @classmethod
+        def customise_sources(cls, init_settings, env_settings, file_secret_settings):
+            # Zmienne środowiskowe mają pierwszeństwo przed plikiem konfiguracji
+            return init_settings, env_settings, json_config_settings_source, file_secret_settings
+    
+    @validator("SECRET_KEY", always=True)
+    def _default_secret_key(cls, value: str) -> str:
+        if value:
+            return value
+        logger.warning(
+            "Nie skonfigurowano SECRET_KEY - użyto klucza losowego. Tokeny stracą ważność "
+            "po restarcie i nie będą akceptowane przez inne procesy ani węzły."
+        )
+        return secrets.token_urlsafe(32)
+    
+    @property
+    def verification_keys(self) -> List[str]:
+        """Klucze akceptowane przy weryfikacji tokenów: bieżący i poprzednie."""
+        return [self.SECRET_KEY, *self.PREVIOUS_SECRET_KEYS]
+    
+    @property
+    def async_database_uri(self) -> str:
+        """Adres bazy dla silnika asynchronicznego, domyślnie wyprowadzony z adresu synchronicznego."""
+        if self.SQLALCHEMY_ASYNC_DATABASE_URI:
+            return self.SQLALCHEMY_ASYNC_DATABASE_URI
+        return self.SQLALCHEMY_DATABASE_URI.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    
+    @property
+    def async_read_database_uri(self) -> Optional[str]:
+        """Adres repliki dla silnika asynchronicznego, domyślnie wyprowadzony z adresu synchronicznego."""
+        if self.SQLALCHEMY_ASYNC_READ_DATABASE_URI:
+            return self.SQLALCHEMY_ASYNC_READ_DATABASE_URI
+        if self.SQLALCHEMY_READ_DATABASE_URI:
+            return self.SQLALCHEMY_READ_DATABASE_URI.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return None
 
 
 settings = Settings() 
\ No newline at end of file
@@ -1,16 +1,239 @@
-from sqlalchemy import create_engine
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 
+from app.core import metrics, profiler, search
 from app.core.config import settings
 
+T = TypeVar("T")
+
+# Sesja przekazywana do endpointów (synchroniczna lub asynchroniczna)
+DbSession = Union[Session, AsyncSession]
+
+
+def is_sqlite(uri: str) -> bool:
+    """Sprawdza, czy adres wskazuje na bazę SQLite."""
+    return uri.startswith("sqlite")
+
+
+def is_sqlite_memory(uri: str) -> bool:
+    """Sprawdza, czy adres wskazuje na bazę SQLite w pamięci."""
+    return is_sqlite(uri) and (":memory:" in uri or uri.rstrip("/").endswith(":"))
+
+
+def sqlite_read_only_uri(uri: str) -> Optional[str]:
+    """
+    Zwraca adres tego samego pliku SQLite otwieranego w trybie tylko do odczytu.
+    
+    Args:
+        uri: Adres bazy danych.
+        
+    Returns:
+        Adres z `mode=ro` lub None, jeśli adres nie wskazuje na plik SQLite.
+    """
+    if not is_sqlite(uri) or is_sqlite_memory(uri):
+        return None
+    url = make_url(uri)
+    return f"{url.drivername}:///file:{url.database}?mode=ro&uri=true"
+
+
+def get_read_database_uri(is_async: bool = False) -> Optional[str]:
+    """
+    Zwraca adres bazy dla silnika tylko do odczytu.
+    
+    Domyślnie jest to replika z ustawień, a bez niej ten sam plik SQLite
+    otwierany w trybie `mode=ro` (osobna pula, więc długie odczyty nie
+    zajmują połączeń używanych do zapisu).
+    
+    Args:
+        is_async: Czy adres dotyczy silnika asynchronicznego.
+        
+    Returns:
+        Adres bazy lub None, jeśli odczyty mają korzystać z silnika głównego.
+    """
+    if not settings.DB_READ_ROUTING:
+        return None
+    uri = settings.async_read_database_uri if is_async else settings.SQLALCHEMY_READ_DATABASE_URI
+    if uri:
+        return uri
+    return sqlite_read_only_uri(
+        settings.async_database_uri if is_async else settings.SQLALCHEMY_DATABASE_URI
+    )
+
+
+def get_sqlite_pragmas(read_only: bool = False) -> List[Tuple[str, Any]]:
+    """
+    Zwraca profil połączenia SQLite zdefiniowany w ustawieniach.
+    
+    Args:
+        read_only: Czy profil dotyczy połączeń tylko do odczytu (bez ustawień
+            dziennika, których nie można zmienić w trybie `mode=ro`).
+        
+    Returns:
+        Lista par (nazwa PRAGMA, wartość) w kolejności ustawiania.
+    """
+    journal = [] if read_only else [
+        ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+        ("synchronous", settings.SQLITE_SYNCHRONOUS),
+    ]
+    return journal + [
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+        ("cache_size", settings.SQLITE_CACHE_SIZE),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        ("temp_store", settings.SQLITE_TEMP_STORE),
+    ]
+
+
+def _set_pragmas(dbapi_connection, pragmas: List[Tuple[str, Any]]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Ustawia profil SQLite na nowym połączeniu (słuchacz zdarzenia `connect`).
+    
+    WAL pozwala czytelnikom działać równolegle z zapisem, a `synchronous=NORMAL`
+    w trybie WAL wykonuje fsync przy punktach kontrolnych zamiast przy każdym commicie.
+    """
+    _set_pragmas(dbapi_connection, get_sqlite_pragmas())
+
+
+def apply_sqlite_read_pragmas(dbapi_connection, connection_record) -> None:
+    """Ustawia profil SQLite na nowym połączeniu tylko do odczytu."""
+    _set_pragmas(dbapi_connection, get_sqlite_pragmas(read_only=True))
+
+
+def pool_label(role: str, is_async: bool = False) -> str:
+    """Zwraca etykietę puli w metrykach, np. "primary" lub "read_async"."""
+    return f"{role}_async" if is_async else role
+
+
+def get_pool_class(is_async: bool = False, role: str = "primary") -> type:
+    """Zwraca klasę puli połączeń; przy włączonych metrykach mierzy ona czas oczekiwania."""
+    pool_class = AsyncAdaptedQueuePool if is_async else QueuePool
+    if settings.METRICS_ENABLED:
+        return metrics.timed_pool_class(pool_class, pool_label(role, is_async))
+    return pool_class
+
+
+def get_engine_options(uri: str, is_async: bool = False, role: str = "primary") -> Dict[str, Any]:
+    """
+    Zwraca parametry silnika (argumenty połączenia i rozmiar puli) dla adresu bazy.
+    
+    Args:
+        uri: Adres bazy danych.
+        is_async: Czy parametry dotyczą silnika asynchronicznego.
+        role: Rola silnika ("primary" lub "read"), od której zależy rozmiar puli.
+        
+    Returns:
+        Słownik argumentów dla `create_engine` lub `create_async_engine`.
+    """
+    options: Dict[str, Any] = {}
+    if is_sqlite(uri):
+        options["connect_args"] = {"check_same_thread": False}
+    # Baza w pamięci używa puli jednego połączenia, której nie da się skonfigurować
+    if not is_sqlite_memory(uri):
+        read = role == "read"
+        options.update(
+            poolclass=get_pool_class(is_async, role),
+            pool_size=settings.DB_READ_POOL_SIZE if read else settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_READ_MAX_OVERFLOW if read else settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+def instrument_engine(db_engine: Engine, label: str = "primary") -> None:
+    """Rejestruje pomiary zapytań i puli silnika (metryki i profiler SQL) zgodnie z ustawieniami."""
+    if settings.METRICS_ENABLED:
+        metrics.instrument_engine(db_engine)
+        metrics.register_pool(label, db_engine)
+    if settings.SQL_PROFILER_ENABLED:
+        profiler.instrument_engine(db_engine)
+
+
+def _configure_engine(db_engine: Engine, uri: str, role: str, is_async: bool) -> None:
+    if is_sqlite(uri):
+        listener = apply_sqlite_read_pragmas if role == "read" else apply_sqlite_pragmas
+        event.listen(db_engine, "connect", listener)
+    instrument_engine(db_engine, pool_label(role, is_async))
+
+
+def create_db_engine(uri: str, role: str = "primary") -> Engine:
+    """
+    Tworzy silnik SQLAlchemy z profilem połączenia z ustawień.
+    
+    Args:
+        uri: Adres bazy danych.
+        role: Rola silnika ("primary" dla zapisu lub "read" tylko do odczytu).
+        
+    Returns:
+        Skonfigurowany silnik.
+    """
+    db_engine = create_engine(uri, **get_engine_options(uri, role=role))
+    _configure_engine(db_engine, uri, role, is_async=False)
+    return db_engine
+
+
+def create_async_db_engine(uri: str, role: str = "primary") -> AsyncEngine:
+    """Odpowiednik `create_db_engine` dla silnika asynchronicznego."""
+    db_engine = create_async_engine(uri, **get_engine_options(uri, is_async=True, role=role))
+    _configure_engine(db_engine.sync_engine, uri, role, is_async=True)
+    return db_engine
+
+
 # Utworzenie silnika SQLAlchemy
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, connect_args={"check_same_thread": False}
+engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URI)
+
+# Silnik tylko do odczytu z osobną pulą (bez adresu odczytu odczyty używają silnika głównego)
+read_database_uri = get_read_database_uri()
+read_engine = create_db_engine(read_database_uri, "read") if read_database_uri else engine
+
+# Sesja do komunikacji z bazą danych; obiekty nie są unieważniane po commicie,
+# więc zwrócenie zapisanego zadania nie wymaga ponownego SELECT
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
 )
 
-# Sesja do komunikacji z bazą danych
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Silniki i sesje asynchroniczne, tworzone tylko w trybie asynchronicznym
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if settings.ASYNC_DATABASE:
+    async_engine = create_async_db_engine(settings.async_database_uri)
+    async_read_database_uri = get_read_database_uri(is_async=True)
+    async_read_engine = (
+        create_async_db_engine(async_read_database_uri, "read")
+        if async_read_database_uri else async_engine
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine, autoflush=False, expire_on_commit=False
+    )
 
 # Bazowa klasa dla modeli SQLAlchemy
 Base = declarative_base()
@@ -25,4 +248,83 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Asynchroniczny generator dostarczający sesję bazy danych dla endpointów.
+    Zapewnia zamknięcie sesji po zakończeniu zapytania.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """
+    Generator dostarczający sesję tylko do odczytu dla endpointów GET.
+    
+    Sesja korzysta z silnika `read_engine`, więc odczyty nie zajmują
+    połączeń puli używanej do zapisu.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """Asynchroniczny odpowiednik `get_read_db`."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+# Zależności używane przez routery, wybierane na podstawie ustawień
+get_session = get_async_db if settings.ASYNC_DATABASE else get_db
+get_read_session = get_async_read_db if settings.ASYNC_DATABASE else get_read_db
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Wykonuje funkcję operującą na synchronicznej sesji bez blokowania pętli zdarzeń.
+
+    W trybie asynchronicznym funkcja otrzymuje synchroniczny widok sesji
+    `AsyncSession` (`run_sync`), a w trybie synchronicznym jest wykonywana
+    w puli wątków. Dzięki temu logika z `app.crud` jest wspólna dla obu trybów.
+
+    Args:
+        db: Sesja synchroniczna lub asynchroniczna.
+        fn: Funkcja przyjmująca sesję jako pierwszy argument.
+
+    Returns:
+        Wynik funkcji.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def init_db() -> None:
+    """
+    Tworzy brakujące tabele oraz indeksy w bazie danych.
+    
+    `create_all` pomija istniejące tabele razem z ich indeksami, dlatego
+    indeksy dodane później w modelach tworzone są osobno. W SQLite tworzony
+    jest też indeks pełnotekstowy zadań (FTS5) wraz z wyzwalaczami.
+    """
+    Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    if is_sqlite(settings.SQLALCHEMY_DATABASE_URI):
+        with engine.begin() as connection:
+            search.create_search_index(connection)
+
+
+async def dispose_engines() -> None:
+    """Zamyka wszystkie połączenia w pulach silników (przy zamykaniu aplikacji)."""
+    for async_db_engine in {async_engine, async_read_engine} - {None}:
+        await async_db_engine.dispose()
+    for db_engine in {engine, read_engine}:
+        db_engine.dispose()
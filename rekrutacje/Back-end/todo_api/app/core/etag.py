@@ -0,0 +1,42 @@
+import hashlib
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Tworzy słaby znacznik ETag z podanych składników.
+    
+    Args:
+        parts: Wartości, od których zależy treść odpowiedzi.
+        
+    Returns:
+        Znacznik w postaci `W/"..."`.
+    """
+    raw = ":".join(str(part) for part in parts)
+    digest = hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Sprawdza, czy nagłówek If-None-Match pasuje do znacznika (porównanie słabe).
+    
+    `*` pasuje tylko do istniejącego zasobu, czego nie da się stwierdzić bez
+    jego odczytu, dlatego nie jest traktowane jako dopasowanie: klient otrzymuje
+    pełną odpowiedź (lub 404/403) zamiast 304.
+    
+    Args:
+        if_none_match: Wartość nagłówka If-None-Match.
+        etag: Aktualny znacznik zasobu.
+        
+    Returns:
+        True, jeśli klient posiada aktualną wersję zasobu.
+    """
+    if not if_none_match or if_none_match.strip() == "*":
+        return False
+    
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+    
+    return any(opaque(tag) == opaque(etag) for tag in if_none_match.split(","))
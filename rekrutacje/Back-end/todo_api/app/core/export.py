@@ -0,0 +1,60 @@
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, Dict, Sequence
+
+from app.core.responses import dumps
+from app.schemas.task import TaskFileFormat
+
+# Typ MIME odpowiedzi dla każdego formatu eksportu
+EXPORT_MEDIA_TYPES: Dict[TaskFileFormat, str] = {
+    TaskFileFormat.ndjson: "application/x-ndjson",
+    TaskFileFormat.csv: "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    """Zapisuje wartości tak jak w JSON (daty ISO 8601, true/false), a brak wartości jako pustą komórkę."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_header(export_format: TaskFileFormat, columns: Sequence[str]) -> bytes:
+    """
+    Zwraca początek pliku eksportu (wiersz nagłówka CSV; NDJSON go nie ma).
+
+    Args:
+        export_format: Format eksportu.
+        columns: Nazwy kolumn w kolejności wierszy.
+
+    Returns:
+        Zakodowany nagłówek lub pusty ciąg bajtów.
+    """
+    if export_format is TaskFileFormat.csv:
+        return encode_rows(export_format, [columns])
+    return b""
+
+
+def encode_rows(export_format: TaskFileFormat, rows: Sequence[Any]) -> bytes:
+    """
+    Koduje porcję wierszy w wybranym formacie.
+
+    Args:
+        export_format: Format eksportu.
+        rows: Wiersze (krotki kolumn) jednej porcji wyniku zapytania.
+
+    Returns:
+        Zakodowana porcja, zakończona znakiem nowej linii.
+    """
+    if export_format is TaskFileFormat.ndjson:
+        return b"".join(dumps(row._asdict()) + b"\n" for row in rows)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
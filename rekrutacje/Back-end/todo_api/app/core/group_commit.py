@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.database import run_db
+
+logger = logging.getLogger(__name__)
+
+
+class PendingWrite:
+    """Zapis oczekujący na zatwierdzenie w transakcji grupowej."""
+
+    __slots__ = ("fn", "args", "future", "result", "error")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, future: asyncio.Future):
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _apply_writes(db: Session, writes: List[PendingWrite]) -> Optional[PendingWrite]:
+    """
+    Wykonuje kolejne zapisy w bieżącej transakcji bez jej zatwierdzania.
+
+    Po każdym zapisie sesja jest czyszczona z obiektów, więc wynik zwrócony
+    jednemu żądaniu nie zmienia się przy kolejnym zapisie tego samego wiersza.
+
+    Returns:
+        Pierwszy zapis zakończony wyjątkiem lub None, jeśli wszystkie się powiodły.
+    """
+    for write in writes:
+        try:
+            write.result = write.fn(db, *write.args, commit=False)
+        except Exception as exc:
+            write.error = exc
+            return write
+        db.expunge_all()
+    return None
+
+
+def execute_writes(db: Session, writes: List[PendingWrite]) -> None:
+    """
+    Wykonuje zapisy w jednej transakcji i zapisuje wynik lub błąd każdego z nich.
+
+    Zapis zakończony wyjątkiem jest wycofywany razem z transakcją, a pozostałe
+    wykonywane są ponownie bez niego. Jeśli nie powiedzie się samo zatwierdzenie
+    transakcji, każdy zapis wykonywany jest w osobnej transakcji, dzięki czemu
+    błąd trafia tylko do żądania, które go spowodowało.
+
+    Args:
+        db: Sesja bazy danych.
+        writes: Zapisy w kolejności nadejścia.
+    """
+    remaining = list(writes)
+    while remaining:
+        failed = _apply_writes(db, remaining)
+        if failed is not None:
+            db.rollback()
+            remaining.remove(failed)
+            continue
+        try:
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            if len(remaining) == 1:
+                remaining[0].error = exc
+            else:
+                for write in remaining:
+                    execute_writes(db, [write])
+            return
+        metrics.GROUP_COMMIT_BATCH_SIZE.observe(len(remaining))
+        return
+
+
+class WriteCoordinator:
+    """
+    Koordynator łączący współbieżne zapisy w jedną transakcję (group commit).
+
+    Zapisy przekazane przez `submit` w oknie `window_seconds` (lub do zebrania
+    `max_batch` zapisów) wykonywane są jedną sesją i zatwierdzane jednym
+    commitem, a każde żądanie otrzymuje własny wynik lub wyjątek. W SQLite
+    oznacza to jedną blokadę zapisu i jeden fsync na grupę zamiast na żądanie,
+    kosztem opóźnienia pojedynczego zapisu o długość okna.
+
+    Funkcje zapisu przyjmują sesję jako pierwszy argument i parametr `commit`,
+    tak jak funkcje zapisu z `app.crud`.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        window_seconds: float = 0.002,
+        max_batch: int = 64,
+    ):
+        """
+        Args:
+            session_factory: Fabryka sesji synchronicznych lub asynchronicznych.
+            window_seconds: Czas zbierania zapisów przed zatwierdzeniem grupy.
+            max_batch: Maksymalna liczba zapisów w jednej transakcji.
+        """
+        self.session_factory = session_factory
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._pending: List[PendingWrite] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Dodaje zapis do najbliższej grupy i czeka na jego zatwierdzenie.
+
+        Args:
+            fn: Funkcja zapisu przyjmująca sesję jako pierwszy argument.
+            *args: Pozostałe argumenty funkcji.
+
+        Returns:
+            Wynik funkcji po zatwierdzeniu transakcji.
+
+        Raises:
+            Exception: Wyjątek zgłoszony przez funkcję lub przy zatwierdzaniu jej zapisu.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(PendingWrite(fn, args, future))
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_pending())
+        return await future
+
+    async def _flush_pending(self) -> None:
+        """Zatwierdza kolejne grupy zapisów, dopóki są zapisy oczekujące."""
+        try:
+            while self._pending:
+                if len(self._pending) < self.max_batch:
+                    await asyncio.sleep(self.window_seconds)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                await self._commit_batch(batch)
+        finally:
+            self._flusher = None
+
+    async def _commit_batch(self, batch: List[PendingWrite]) -> None:
+        """Wykonuje grupę zapisów we własnej sesji i przekazuje wyniki oczekującym żądaniom."""
+        try:
+            session = self.session_factory()
+            if isinstance(session, AsyncSession):
+                async with session:
+                    await run_db(session, execute_writes, batch)
+            else:
+                with session:
+                    await run_db(session, execute_writes, batch)
+        except Exception as exc:
+            logger.exception("Zatwierdzenie grupy %d zapisów nie powiodło się", len(batch))
+            for write in batch:
+                write.error = write.error or exc
+        for write in batch:
+            if write.future.done():
+                continue
+            if write.error is not None:
+                write.future.set_exception(write.error)
+            else:
+                write.future.set_result(write.result)
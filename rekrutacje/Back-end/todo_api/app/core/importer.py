@@ -0,0 +1,160 @@
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.schemas.task import TaskFileFormat
+
+# Rekord importu: numer linii oraz dane zadania albo opis błędu
+ImportRecord = Tuple[int, Union[Dict[str, Any], str]]
+
+LINE_TOO_LONG = "Rekord przekracza dopuszczalną długość."
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Dzieli strumień bajtów na linie bez wczytywania całej treści do pamięci.
+
+    Linia dłuższa niż `max_line_bytes` jest odrzucana w trakcie odczytu
+    i zwracana jako None, więc bufor nigdy nie przekracza tego limitu
+    (powiększonego o rozmiar jednej porcji).
+
+    Args:
+        chunks: Porcje treści żądania.
+        max_line_bytes: Maksymalna długość linii w bajtach.
+
+    Yields:
+        Numer linii (od 1) i jej treść bez znaku końca linii albo None.
+    """
+    buffer = b""
+    line_number = 0
+    overflow = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            too_long = overflow or len(line) > max_line_bytes
+            overflow = False
+            yield line_number, None if too_long else line
+        if len(buffer) > max_line_bytes:
+            # Reszta linii jest pomijana aż do najbliższego znaku nowej linii
+            overflow = True
+            buffer = b""
+    if buffer or overflow:
+        yield line_number + 1, None if overflow else buffer
+
+
+def _decode(line: bytes, line_number: int) -> str:
+    """Dekoduje linię UTF-8, pomijając znacznik BOM na początku pliku i znak CR."""
+    if line_number == 1 and line.startswith(b"\xef\xbb\xbf"):
+        line = line[3:]
+    return line.rstrip(b"\r").decode("utf-8")
+
+
+async def iter_ndjson_records(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[ImportRecord]:
+    """Parsuje NDJSON: każda niepusta linia to jeden obiekt JSON."""
+    async for line_number, line in iter_lines(chunks, max_line_bytes):
+        if line is None:
+            yield line_number, LINE_TOO_LONG
+            continue
+        try:
+            text = _decode(line, line_number)
+            if not text.strip():
+                continue
+            record = json.loads(text)
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            yield line_number, f"Nieprawidłowy JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Linia musi zawierać obiekt JSON."
+            continue
+        yield line_number, record
+
+
+async def iter_csv_records(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[ImportRecord]:
+    """
+    Parsuje CSV z wierszem nagłówka zawierającym nazwy pól zadania.
+
+    Rekord z polem w cudzysłowie może obejmować kilka linii; linie są
+    łączone, dopóki liczba cudzysłowów jest nieparzysta. Puste komórki
+    są pomijane, więc przyjmują wartości domyślne schematu.
+    """
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    pending_size = 0
+    start = 0
+    async for line_number, line in iter_lines(chunks, max_line_bytes):
+        if line is not None:
+            try:
+                text = _decode(line, line_number)
+            except UnicodeDecodeError as exc:
+                pending, pending_size = [], 0
+                yield line_number, f"Nieprawidłowe kodowanie znaków: {exc}"
+                continue
+            pending_size += len(line)
+        if line is None or pending_size > max_line_bytes:
+            position = start if pending else line_number
+            pending, pending_size = [], 0
+            yield position, LINE_TOO_LONG
+            continue
+
+        if not pending:
+            if not text.strip():
+                pending_size = 0
+                continue
+            start = line_number
+        pending.append(text)
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+
+        record = "\n".join(pending)
+        pending, pending_size = [], 0
+        try:
+            row = next(csv.reader([record]))
+        except csv.Error as exc:
+            yield start, f"Nieprawidłowy wiersz CSV: {exc}"
+            continue
+
+        if header is None:
+            header = [name.strip() for name in row]
+        elif len(row) != len(header):
+            yield start, f"Oczekiwano {len(header)} kolumn, otrzymano {len(row)}."
+        else:
+            yield start, {name: value for name, value in zip(header, row) if value != ""}
+    if pending:
+        yield start, "Niezamknięty cudzysłów na końcu pliku."
+
+
+def iter_records(
+    file_format: TaskFileFormat, chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[ImportRecord]:
+    """
+    Parsuje przyrostowo treść importu w wybranym formacie.
+
+    Args:
+        file_format: Format pliku.
+        chunks: Porcje treści żądania.
+        max_line_bytes: Maksymalna długość rekordu w bajtach.
+
+    Returns:
+        Asynchroniczny iterator rekordów (numer linii, dane lub opis błędu).
+    """
+    if file_format is TaskFileFormat.csv:
+        return iter_csv_records(chunks, max_line_bytes)
+    return iter_ndjson_records(chunks, max_line_bytes)
+
+
+def validation_detail(exc: ValidationError) -> str:
+    """Łączy błędy walidacji Pydantic w jeden komunikat dla raportu importu."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
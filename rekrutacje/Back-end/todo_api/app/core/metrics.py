@@ -0,0 +1,374 @@
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Domyślne przedziały histogramów czasu (w sekundach)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Typ MIME formatu tekstowego Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Licznik monotoniczny z opcjonalnymi etykietami."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, labels: Tuple[str, ...] = ()) -> None:
+        """Zwiększa licznik dla podanych wartości etykiet."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> List[str]:
+        """Zwraca linie formatu tekstowego dla licznika."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}{label_text} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogram z przedziałami skumulowanymi przy eksporcie."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Dla każdego zestawu etykiet: liczności przedziałów (ostatni to +Inf) i suma
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        """Rejestruje obserwację dla podanych wartości etykiet."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def collect(self) -> List[str]:
+        """Zwraca linie formatu tekstowego dla histogramu."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            values = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            ]
+        names = self.labelnames + ("le",)
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                label_text = _format_labels(names, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Zbiór metryk oraz funkcji zwracających wartości odczytywane przy eksporcie."""
+
+    def __init__(self):
+        self._metrics: List[object] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric):
+        """Dodaje metrykę do rejestru i zwraca ją."""
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """Dodaje funkcję zwracającą gotowe linie formatu tekstowego."""
+        self._collectors.append(collector)
+
+    def render(self) -> bytes:
+        """Zwraca wszystkie metryki w formacie tekstowym Prometheus."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def sample_lines(
+    name: str,
+    documentation: str,
+    metric_type: str,
+    values: Dict[Tuple[str, ...], float],
+    labelnames: Sequence[str] = (),
+) -> List[str]:
+    """
+    Buduje linie formatu tekstowego dla wartości odczytanych w chwili eksportu.
+
+    Args:
+        name: Nazwa metryki.
+        documentation: Opis metryki.
+        metric_type: Typ metryki (`counter` lub `gauge`).
+        values: Wartości dla kolejnych zestawów etykiet.
+        labelnames: Nazwy etykiet.
+
+    Returns:
+        Linie formatu tekstowego.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in values.items():
+        lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+    return lines
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "Liczba obsłużonych żądań HTTP.", ("method", "route", "status"),
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Czas obsługi żądania HTTP.", ("method", "route"),
+))
+HTTP_REQUEST_DB_QUERIES = REGISTRY.register(Histogram(
+    "http_request_db_queries", "Liczba zapytań SQL wykonanych podczas żądania.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+))
+HTTP_REQUEST_DB_DURATION = REGISTRY.register(Histogram(
+    "http_request_db_duration_seconds", "Łączny czas zapytań SQL podczas żądania.",
+    ("method", "route"),
+))
+DB_QUERIES = REGISTRY.register(Counter(
+    "db_queries_total", "Liczba wykonanych zapytań SQL.",
+))
+DB_QUERY_DURATION = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "Czas wykonania pojedynczego zapytania SQL.",
+))
+DB_POOL_WAIT = REGISTRY.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Czas oczekiwania na połączenie z puli.", ("pool",),
+))
+GROUP_COMMIT_BATCH_SIZE = REGISTRY.register(Histogram(
+    "group_commit_batch_size", "Liczba zapisów zatwierdzonych jedną transakcją grupową.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+))
+PASSWORD_HASH_DURATION = REGISTRY.register(Histogram(
+    "password_hash_duration_seconds",
+    "Czas hashowania lub weryfikacji hasła (razem z oczekiwaniem w kolejce puli).",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+
+RATE_LIMIT_REJECTIONS = REGISTRY.register(Counter(
+    "rate_limit_rejections_total", "Liczba żądań odrzuconych przez ogranicznik.", ("rule",),
+))
+
+
+class RequestStats:
+    """Liczba i łączny czas zapytań SQL bieżącego żądania."""
+
+    __slots__ = ("queries", "duration")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+
+# Statystyki żądania; obiekt jest współdzielony z kontekstem kopiowanym do puli wątków
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_query(duration: float) -> None:
+    """Rejestruje wykonane zapytanie SQL globalnie i w statystykach bieżącego żądania."""
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(duration)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.duration += duration
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Rejestruje zdarzenia silnika mierzące czas każdego zapytania.
+
+    Args:
+        engine: Silnik synchroniczny (dla silnika asynchronicznego `sync_engine`).
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        record_query(time.perf_counter() - context._metrics_start)
+
+
+class TimedPoolMixin:
+    """Domieszka puli połączeń mierząca czas oczekiwania na wydanie połączenia."""
+
+    metrics_label = ""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start, (self.metrics_label,))
+
+
+# Klasy puli tworzone dla par (klasa bazowa, rola silnika); rola jest atrybutem klasy,
+# więc zostaje zachowana, gdy SQLAlchemy odtwarza pulę (`Pool.recreate`)
+_pool_classes: Dict[Tuple[type, str], type] = {}
+
+
+def timed_pool_class(base: type, label: str) -> type:
+    """
+    Zwraca klasę puli mierzącą czas oczekiwania na połączenie.
+
+    Args:
+        base: Klasa bazowa puli (`QueuePool` lub `AsyncAdaptedQueuePool`).
+        label: Wartość etykiety `pool` w metrykach (np. "primary" lub "read").
+
+    Returns:
+        Podklasa `base` z domieszką `TimedPoolMixin`.
+    """
+    key = (base, label)
+    if key not in _pool_classes:
+        _pool_classes[key] = type(f"Timed{base.__name__}", (TimedPoolMixin, base), {
+            "metrics_label": label,
+            # Komunikaty puli trafiają do loggerów SQLAlchemy, tak jak dla klas bazowych
+            "_sqla_logger_namespace": f"sqlalchemy.pool.impl.{base.__name__}",
+        })
+    return _pool_classes[key]
+
+
+# Silniki, których pule są raportowane w metrykach, według roli
+_pool_engines: Dict[str, Engine] = {}
+
+
+def register_pool(label: str, engine: Engine) -> None:
+    """
+    Dodaje pulę silnika do metryki `db_pool_connections`.
+
+    Args:
+        label: Wartość etykiety `pool` (rola silnika).
+        engine: Silnik synchroniczny (dla silnika asynchronicznego `sync_engine`).
+    """
+    _pool_engines[label] = engine
+
+
+def _pool_metrics() -> List[str]:
+    """Zwraca stan zarejestrowanych pul połączeń w formacie metryk."""
+    values: Dict[Tuple[str, ...], float] = {}
+    for label, engine in _pool_engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        values[(label, "size")] = pool.size()
+        values[(label, "checked_out")] = pool.checkedout()
+        values[(label, "idle")] = pool.checkedin()
+        values[(label, "overflow")] = max(0, pool.overflow())
+    return sample_lines(
+        "db_pool_connections", "Liczba połączeń w puli według stanu.", "gauge",
+        values, ("pool", "state"),
+    )
+
+
+REGISTRY.add_collector(_pool_metrics)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI mierzące liczbę, czas i statusy żądań dla każdej trasy.
+
+    Trasa opisywana jest szablonem ścieżki (np. `/api/v1/tasks/{task_id}`),
+    a nie ścieżką żądania, więc liczba serii metryk jest ograniczona.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[Callable, str] = {}
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            # Router zapisuje w scope funkcję endpointu; szablon ścieżki odczytywany z tras aplikacji
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            self._route_paths[endpoint] = path = path or "unmatched"
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            _request_stats.reset(token)
+            labels = (scope["method"], self._route_path(scope))
+            HTTP_REQUESTS.inc(labels=labels + (str(status_code),))
+            HTTP_REQUEST_DURATION.observe(duration, labels)
+            HTTP_REQUEST_DB_QUERIES.observe(stats.queries, labels)
+            HTTP_REQUEST_DB_DURATION.observe(stats.duration, labels)
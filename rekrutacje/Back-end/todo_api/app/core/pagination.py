@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Koduje pozycję ostatniego elementu strony jako nieprzezroczysty kursor.
+
+    Args:
+        values: Wartości klucza sortowania, zakończone identyfikatorem.
+
+    Returns:
+        Kursor w postaci tekstu base64 bezpiecznego dla adresów URL.
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: Optional[int] = None) -> List[Any]:
+    """
+    Dekoduje kursor utworzony przez `encode_cursor`.
+
+    Args:
+        cursor: Kursor otrzymany od klienta.
+        size: Oczekiwana liczba wartości w kursorze.
+
+    Returns:
+        Lista wartości klucza sortowania.
+
+    Raises:
+        ValueError: Jeśli kursor jest uszkodzony.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if not isinstance(values, list):
+            raise ValueError("Kursor musi zawierać listę wartości.")
+        if size is not None and len(values) != size:
+            raise ValueError("Nieprawidłowa liczba wartości w kursorze.")
+        return [_decode_value(value) for value in values]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError) as exc:
+        raise ValueError("Nieprawidłowy kursor.") from exc
@@ -0,0 +1,117 @@
+import collections
+import contextvars
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryProfile:
+    """Zapytania SQL wykonane podczas jednego żądania."""
+
+    __slots__ = ("queries", "duration", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        # Liczba wykonań każdej instrukcji (tekst SQL z parametrami zastępczymi)
+        self.statements: collections.Counter = collections.Counter()
+
+
+_profile: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar(
+    "sql_profile", default=None
+)
+
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Rejestruje zdarzenia silnika profilujące każde zapytanie SQL.
+
+    Zapytania dłuższe niż `SQL_SLOW_QUERY_MS` są logowane niezależnie od tego,
+    czy zostały wykonane w trakcie żądania HTTP.
+
+    Args:
+        engine: Silnik synchroniczny (dla silnika asynchronicznego `sync_engine`).
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._profiler_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._profiler_start
+        if duration * 1000 >= settings.SQL_SLOW_QUERY_MS:
+            logger.warning(
+                "Wolne zapytanie SQL (%.1f ms): %s", duration * 1000, _shorten(statement)
+            )
+        profile = _profile.get()
+        if profile is not None:
+            profile.queries += 1
+            profile.duration += duration
+            profile.statements[statement] += 1
+
+
+class SQLProfilerMiddleware:
+    """
+    Middleware ASGI zliczające i mierzące zapytania SQL każdego żądania.
+
+    Sumy dodawane są do nagłówków `X-DB-Queries` i `Server-Timing`, więc
+    obejmują zapytania wykonane przed wysłaniem nagłówków odpowiedzi
+    (w odpowiedziach strumieniowanych nie obejmują treści). Instrukcje
+    powtórzone co najmniej `SQL_N_PLUS_ONE_THRESHOLD` razy są logowane
+    jako podejrzenie problemu N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                duration_ms = profile.duration * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(profile.queries).encode()))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={duration_ms:.2f};desc="{profile.queries} SQL"'.encode(),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _profile.reset(token)
+            self._report(scope, profile)
+
+    @staticmethod
+    def _report(scope, profile: QueryProfile) -> None:
+        request = f"{scope['method']} {scope['path']}"
+        for statement, count in profile.statements.most_common():
+            if count < settings.SQL_N_PLUS_ONE_THRESHOLD:
+                break
+            logger.warning(
+                "Możliwy problem N+1 w %s: instrukcja wykonana %d razy: %s",
+                request, count, _shorten(statement),
+            )
+        logger.debug(
+            "%s: %d zapytań SQL, %.2f ms", request, profile.queries, profile.duration * 1000
+        )
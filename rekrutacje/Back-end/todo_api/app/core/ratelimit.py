@@ -0,0 +1,120 @@
+import abc
+import collections
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Parametry kubełka tokenów: pojemność (seria żądań) i tempo uzupełniania (> 0)."""
+
+    burst: int
+    per_minute: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60
+
+
+class RateLimitBackend(abc.ABC):
+    """
+    Magazyn stanu kubełków tokenów.
+
+    Domyślny magazyn działa w pamięci procesu; przy kilku procesach roboczych
+    można podstawić implementację opartą na współdzielonym magazynie
+    (np. Redis), która wykonuje `acquire` atomowo.
+    """
+
+    @abc.abstractmethod
+    async def acquire(self, key: str, rule: RateLimitRule) -> float:
+        """
+        Pobiera jeden token z kubełka o podanym kluczu.
+
+        Args:
+            key: Klucz kubełka (np. reguła i adres IP).
+            rule: Parametry kubełka.
+
+        Returns:
+            0, jeśli token został pobrany, w przeciwnym razie liczba sekund
+            do pojawienia się kolejnego tokenu.
+        """
+
+    async def reset(self) -> None:
+        """Usuwa stan wszystkich kubełków."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Kubełki tokenów w pamięci procesu.
+
+    Liczba przechowywanych kubełków jest ograniczona; przy przepełnieniu
+    usuwane są najdawniej używane, co odpowiada ich pełnemu uzupełnieniu.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # Klucz -> (liczba tokenów, czas ostatniej aktualizacji)
+        self._buckets: "collections.OrderedDict[str, Tuple[float, float]]" = (
+            collections.OrderedDict()
+        )
+
+    async def acquire(self, key: str, rule: RateLimitRule) -> float:
+        # Operacja nie zawiera punktów zawieszenia, więc jest atomowa w pętli zdarzeń
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(rule.burst), now))
+        tokens = min(float(rule.burst), tokens + (now - updated) * rule.refill_per_second)
+
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / rule.refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def reset(self) -> None:
+        self._buckets.clear()
+
+
+class RateLimiter:
+    """Ogranicznik żądań z nazwanymi regułami i wymiennym magazynem kubełków."""
+
+    def __init__(self, backend: RateLimitBackend, rules: Dict[str, RateLimitRule]):
+        self.backend = backend
+        self.rules = rules
+
+    async def hit(self, rule_name: str, value: str) -> float:
+        """
+        Rejestruje żądanie w kubełku reguły dla podanej wartości klucza.
+
+        Args:
+            rule_name: Nazwa reguły (np. "ip" lub "username").
+            value: Wartość klucza (adres IP, nazwa użytkownika).
+
+        Returns:
+            0, jeśli żądanie jest dozwolone, w przeciwnym razie czas oczekiwania w sekundach.
+        """
+        return await self.backend.acquire(f"{rule_name}:{value}", self.rules[rule_name])
+
+    async def check(self, **keys: Optional[str]) -> Tuple[Optional[str], float]:
+        """
+        Rejestruje żądanie we wszystkich podanych regułach.
+
+        Args:
+            keys: Nazwa reguły -> wartość klucza; wartości puste są pomijane.
+
+        Returns:
+            Nazwa pierwszej przekroczonej reguły i czas oczekiwania w sekundach
+            albo (None, 0), jeśli żądanie jest dozwolone.
+        """
+        for rule_name, value in keys.items():
+            if not value:
+                continue
+            wait = await self.hit(rule_name, value)
+            if wait > 0:
+                return rule_name, wait
+        return None, 0.0
@@ -0,0 +1,52 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson jest zależnością opcjonalną
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Koduje daty tak samo jak `jsonable_encoder` (format ISO 8601)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Nie można zserializować obiektu typu {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializuje zawartość do zwartego JSON w UTF-8 (orjson lub moduł `json`).
+
+    Args:
+        content: Słowniki, listy i wartości proste, w tym daty.
+
+    Returns:
+        Zakodowany dokument JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Odpowiedź JSON serializowana bez walidacji modeli Pydantic.
+
+    Zawartość (słowniki z prostymi typami i datami) kodowana jest przez orjson,
+    jeśli jest zainstalowany, a w przeciwnym razie przez moduł `json`.
+    Wynik jest bajtowo zgodny z `JSONResponse` po `jsonable_encoder`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,180 @@
+import html
+import logging
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import column, exc, literal_column, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Znaczniki wyróżnienia trafień oraz długość fragmentu opisu (w tokenach).
+# FTS5 oznacza trafienia znakami z obszaru prywatnego Unicode, które po
+# zakodowaniu tekstu zadania jako HTML zastępowane są znacznikami <mark>.
+HIGHLIGHT_MARKER_START = "\ue000"
+HIGHLIGHT_MARKER_END = "\ue001"
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 12
+
+# Maksymalna liczba słów zapytania uwzględnianych w wyszukiwaniu
+MAX_QUERY_TERMS = 16
+
+# Indeks FTS5 z zewnętrzną treścią: tekst zadań przechowywany jest tylko w tabeli
+# `tasks`, a indeks czyta go przez widok. Kolumna `owner` zawiera token
+# właściciela ("u<id>"), dzięki czemu zawężenie do zadań użytkownika odbywa się
+# w indeksie, a sortowanie po trafności z limitem wykonuje samo FTS5.
+SEARCH_DDL = [
+    """
+    CREATE VIEW IF NOT EXISTS tasks_search_source AS
+    SELECT id, title, description, 'u' || owner_id AS owner FROM tasks
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, owner,
+        content='tasks_search_source', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.owner_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.owner_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+    AFTER UPDATE OF title, description, owner_id ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.owner_id);
+        INSERT INTO tasks_fts(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.owner_id);
+    END
+    """,
+    # Ranking BM25: trafienie w tytule waży więcej niż w opisie, token właściciela nic
+    "INSERT INTO tasks_fts(tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 0.0)')",
+]
+
+# Tabela FTS5 do budowania zapytań (poza metadanymi modeli, więc `create_all` jej nie tworzy)
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"))
+fts_match_target = literal_column("tasks_fts")
+
+# Adres bazy -> czy istnieje w niej indeks wyszukiwania
+_index_available: Dict[str, bool] = {}
+
+
+def create_search_index(connection: Connection) -> bool:
+    """
+    Tworzy indeks pełnotekstowy zadań wraz z wyzwalaczami synchronizacji.
+
+    Przy pierwszym utworzeniu indeks wypełniany jest istniejącymi zadaniami.
+    Jeśli SQLite nie obsługuje FTS5, wyszukiwanie korzysta z LIKE.
+
+    Args:
+        connection: Połączenie z bazą SQLite w otwartej transakcji.
+
+    Returns:
+        True, jeśli indeks jest dostępny.
+    """
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'")
+    ).first() is not None
+    if exists:
+        return True
+
+    try:
+        with connection.begin_nested():
+            for statement in SEARCH_DDL:
+                connection.exec_driver_sql(statement)
+            connection.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+    except exc.OperationalError as error:
+        logger.warning("Indeks FTS5 niedostępny, wyszukiwanie użyje LIKE: %s", error.orig)
+        return False
+    return True
+
+
+def is_search_index_available(db: Session) -> bool:
+    """
+    Sprawdza (raz na bazę w procesie), czy baza sesji ma indeks pełnotekstowy zadań.
+
+    Args:
+        db: Sesja bazy danych.
+
+    Returns:
+        True, jeśli można użyć zapytań FTS5.
+    """
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _index_available:
+        _index_available[key] = bind.dialect.name == "sqlite" and db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'")
+        ).first() is not None
+    return _index_available[key]
+
+
+def render_highlight(marked: Optional[str]) -> Optional[str]:
+    """
+    Zamienia tekst z trafieniami oznaczonymi przez FTS5 na bezpieczny HTML.
+
+    Tekst zadania jest kodowany (`html.escape`), a dopiero potem znaczniki
+    trafień zastępowane są elementami <mark>, więc treść zadania nie może
+    wstrzyknąć własnych znaczników.
+
+    Args:
+        marked: Wynik `highlight()` lub `snippet()` ze znacznikami trafień.
+
+    Returns:
+        Fragment HTML lub None, jeśli tekstu nie ma.
+    """
+    if marked is None:
+        return None
+    return (
+        html.escape(marked)
+        .replace(HIGHLIGHT_MARKER_START, HIGHLIGHT_START)
+        .replace(HIGHLIGHT_MARKER_END, HIGHLIGHT_END)
+    )
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    Dzieli tekst zapytania na słowa.
+
+    Składnia zapytań FTS5 (operatory, cudzysłowy, filtry kolumn) nie jest
+    udostępniana klientom, więc z tekstu pobierane są tylko słowa.
+
+    Args:
+        query: Tekst wpisany przez użytkownika.
+
+    Returns:
+        Lista słów (najwyżej `MAX_QUERY_TERMS`).
+    """
+    return re.findall(r"\w+", query)[:MAX_QUERY_TERMS]
+
+
+def build_match_expression(owner_id: int, terms: List[str]) -> Optional[str]:
+    """
+    Buduje wyrażenie MATCH dla zadań właściciela zawierających wszystkie słowa.
+
+    Ostatnie słowo dopasowywane jest jako prefiks, więc wyniki pojawiają się
+    już w trakcie wpisywania zapytania.
+
+    Args:
+        owner_id: Identyfikator właściciela zadań.
+        terms: Słowa zapytania z `query_terms`.
+
+    Returns:
+        Wyrażenie zapytania FTS5 lub None, jeśli zapytanie nie zawiera słów.
+    """
+    if not terms:
+        return None
+    phrases = [f'"{term}"' for term in terms]
+    phrases[-1] += "*"
+    return f'owner : "u{owner_id}" AND ({" ".join(phrases)})'
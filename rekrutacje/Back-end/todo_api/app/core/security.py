@@ -1,17 +1,99 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from jose import jwt
+from jose import JWTError, jwt
 from passlib.context import CryptContext
+from passlib.hash import argon2
 
+from app.core import metrics
 from app.core.config import settings
 
-# Kontekst do hashowania haseł
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Schematy hashowania haseł rozpoznawane przy weryfikacji
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
 
 # Algorytm używany do tworzenia i weryfikacji tokenów JWT
 ALGORITHM = "HS256"
 
+# Ograniczona pula wykonawców dla bcrypt, tworzona przy pierwszym użyciu
+_password_executor: Optional[Executor] = None
+_password_executor_lock = threading.Lock()
+
+
+def create_password_context(
+    scheme: str = "bcrypt",
+    bcrypt_rounds: int = 12,
+    argon2_memory_kib: int = 65536,
+    argon2_time_cost: int = 3,
+    argon2_parallelism: int = 4,
+) -> CryptContext:
+    """
+    Tworzy kontekst hashowania haseł z podanym schematem i kosztem.
+    
+    Nowe hasła hashowane są wybranym schematem. Hashe innego schematu lub
+    o niższym koszcie (mniej rund bcrypt, inne parametry argon2) są nadal
+    weryfikowane, ale oznaczane do zastąpienia (`needs_update`).
+    
+    Args:
+        scheme: Schemat dla nowych hashy ("bcrypt" lub "argon2").
+        bcrypt_rounds: Logarytm liczby rund bcrypt.
+        argon2_memory_kib: Pamięć argon2 w KiB.
+        argon2_time_cost: Liczba iteracji argon2.
+        argon2_parallelism: Liczba wątków argon2.
+        
+    Returns:
+        Skonfigurowany kontekst passlib.
+        
+    Raises:
+        ValueError: Jeśli schemat nie jest obsługiwany.
+        RuntimeError: Jeśli wybrano argon2, a pakiet argon2-cffi nie jest zainstalowany.
+    """
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"Nieobsługiwany schemat hashowania haseł: {scheme}")
+    if scheme == "argon2" and not argon2.has_backend():
+        raise RuntimeError("Schemat argon2 wymaga pakietu argon2-cffi (pip install argon2-cffi).")
+    
+    return CryptContext(
+        schemes=[scheme, *(other for other in PASSWORD_SCHEMES if other != scheme)],
+        deprecated="auto",
+        # Hashe o koszcie wyższym niż docelowy nie są zastępowane
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_desired_rounds=bcrypt_rounds,
+        argon2__memory_cost=argon2_memory_kib,
+        argon2__time_cost=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+# Kontekst do hashowania haseł
+pwd_context = create_password_context(
+    settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_memory_kib=settings.PASSWORD_ARGON2_MEMORY_KIB,
+    argon2_time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+)
+
+
+def key_id(key: str) -> str:
+    """
+    Zwraca identyfikator klucza podpisującego zapisywany w nagłówku `kid` tokenu.
+    
+    Identyfikator jest skrótem klucza, więc nie ujawnia samego klucza, a przy
+    weryfikacji pozwala od razu wybrać właściwy klucz spośród rotowanych.
+    
+    Args:
+        key: Klucz podpisujący.
+        
+    Returns:
+        Identyfikator klucza.
+    """
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -25,37 +107,74 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         Zakodowany token JWT.
     """
     to_encode = data.copy()
+    issued_at = datetime.utcnow()
     
     # Ustawienie czasu ważności tokenu
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
+        expire = issued_at + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
         
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": issued_at})
     
     # Zakodowanie tokenu
     encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=ALGORITHM
+        to_encode,
+        settings.SECRET_KEY,
+        algorithm=ALGORITHM,
+        headers={"kid": key_id(settings.SECRET_KEY)},
     )
     
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Weryfikuje token JWT bieżącym lub jednym z poprzednich kluczy.
+    
+    Klucz wybierany jest według nagłówka `kid`; tokeny bez tego nagłówka
+    sprawdzane są kolejno wszystkimi kluczami weryfikującymi.
+    
+    Args:
+        token: Token JWT.
+        
+    Returns:
+        Zawartość tokenu.
+        
+    Raises:
+        JWTError: Jeśli token jest nieprawidłowy, wygasł lub nie pasuje do żadnego klucza.
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    keys = settings.verification_keys
+    if kid is not None:
+        keys = [key for key in keys if key_id(key) == kid]
+        
+    error: JWTError = JWTError("Nieznany klucz podpisujący tokenu")
+    for key in keys:
+        try:
+            return jwt.decode(token, key, algorithms=[ALGORITHM])
+        except JWTError as exc:
+            error = exc
+    raise error
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
     """
-    Weryfikuje, czy podane hasło zgadza się z zahashowanym.
+    Weryfikuje hasło i, jeśli hash odbiega od bieżących ustawień, tworzy nowy.
     
     Args:
         plain_password: Hasło w czystej postaci.
         hashed_password: Zahashowane hasło.
         
     Returns:
-        True, jeśli hasła się zgadzają, False w przeciwnym wypadku.
+        Wynik weryfikacji oraz nowy hash do zapisania lub None, jeśli hash
+        jest aktualny albo hasło jest nieprawidłowe.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -68,4 +187,83 @@ def get_password_hash(password: str) -> str:
     Returns:
         Zahashowane hasło.
     """
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+def get_password_executor() -> Executor:
+    """
+    Zwraca pulę wykonawców używaną do hashowania i weryfikacji haseł.
+    
+    Rozmiar puli ogranicza liczbę równoległych operacji bcrypt, dzięki czemu
+    seria logowań nie zajmuje wszystkich wątków serwera.
+    
+    Returns:
+        Pula wątków lub procesów zgodnie z ustawieniami.
+    """
+    global _password_executor
+    
+    with _password_executor_lock:
+        if _password_executor is None:
+            if settings.PASSWORD_HASH_EXECUTOR == "process":
+                _password_executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS
+                )
+            else:
+                _password_executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                )
+        return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    """Zamyka pulę wykonawców hashowania haseł, jeśli została utworzona."""
+    global _password_executor
+    
+    with _password_executor_lock:
+        if _password_executor is not None:
+            _password_executor.shutdown(wait=True)
+            _password_executor = None
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Odpowiednik `verify_and_update_password` wykonywany w puli wykonawców.
+    
+    Args:
+        plain_password: Hasło w czystej postaci.
+        hashed_password: Zahashowane hasło.
+        
+    Returns:
+        Wynik weryfikacji oraz nowy hash do zapisania lub None.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await loop.run_in_executor(
+            get_password_executor(), verify_and_update_password, plain_password, hashed_password
+        )
+    finally:
+        metrics.PASSWORD_HASH_DURATION.observe(time.perf_counter() - start, ("verify",))
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hashuje hasło w puli wykonawców, nie blokując pętli zdarzeń.
+    
+    Args:
+        password: Hasło do zahashowania.
+        
+    Returns:
+        Zahashowane hasło.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await loop.run_in_executor(
+            get_password_executor(), get_password_hash, password
+        )
+    finally:
+        metrics.PASSWORD_HASH_DURATION.observe(time.perf_counter() - start, ("hash",))
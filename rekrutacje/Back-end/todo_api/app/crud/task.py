@@ -0,0 +1,921 @@
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import status
+from sqlalchemy import (
+    Select, and_, bindparam, delete, func, insert, null, or_, select, tuple_, update,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core import search
+from app.models.task import Task
+from app.models.task_stats import TaskStats
+from app.models.task_version import TaskListVersion
+from app.schemas.task import Task as TaskSchema
+from app.schemas.task import (
+    TaskBulkItemResult,
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskFilter,
+    TaskSort,
+    TaskStatsSummary,
+    TaskUpdate,
+)
+
+# Kolumna, kierunek sortowania i dopuszczalność NULL dla każdego porządku listy
+# zadań (created_at zawsze ma wartość domyślną, due_date jest opcjonalne)
+SORT_COLUMNS = {
+    TaskSort.created_at: (Task.created_at, False, False),
+    TaskSort.created_at_desc: (Task.created_at, True, False),
+    TaskSort.due_date: (Task.due_date, False, True),
+    TaskSort.due_date_desc: (Task.due_date, True, True),
+}
+
+# Kolumny w kolejności pól schematu odpowiedzi (szybka ścieżka serializacji)
+TASK_COLUMNS = [getattr(Task, field) for field in TaskSchema.__fields__]
+
+
+def get_tasks_version(db: Session, owner_id: int) -> int:
+    """
+    Pobiera wersję listy zadań użytkownika (do wyznaczenia znacznika ETag).
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        
+    Returns:
+        Numer wersji, 0 jeśli użytkownik nie zapisał jeszcze żadnego zadania.
+    """
+    version = db.scalar(
+        select(TaskListVersion.version).where(TaskListVersion.owner_id == owner_id)
+    )
+    return version or 0
+
+
+def bump_tasks_version(db: Session, owner_id: int) -> None:
+    """
+    Zwiększa wersję listy zadań użytkownika w bieżącej transakcji.
+    
+    Wywoływane przez każdą operację zapisu zadań przed zatwierdzeniem transakcji,
+    dzięki czemu wersja zmienia się atomowo razem z danymi.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        statement = sqlite.insert(TaskListVersion).values(owner_id=owner_id, version=1)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[TaskListVersion.owner_id],
+            set_={"version": TaskListVersion.version + 1},
+        ))
+        return
+    
+    result = db.execute(
+        update(TaskListVersion)
+        .where(TaskListVersion.owner_id == owner_id)
+        .values(version=TaskListVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(TaskListVersion).values(owner_id=owner_id, version=1))
+
+
+def adjust_task_stats(db: Session, owner_id: int, total: int = 0, completed: int = 0) -> None:
+    """
+    Zmienia liczniki zadań użytkownika o podane wartości w bieżącej transakcji.
+    
+    Wywoływane razem z `bump_tasks_version` po zapisie, który faktycznie zmienił
+    zadania użytkownika, więc liczniki zmieniają się atomowo razem z danymi.
+    Brakujący wiersz liczników (np. dla zadań sprzed wprowadzenia liczników,
+    gdy uzgadnianie jest wyłączone) tworzony jest z liczby zadań w tabeli,
+    która obejmuje już bieżący zapis.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        total: Zmiana liczby wszystkich zadań.
+        completed: Zmiana liczby ukończonych zadań.
+    """
+    if not total and not completed:
+        return
+    
+    columns = [TaskStats.owner_id, TaskStats.total, TaskStats.completed]
+    # WHERE jest wymagane przez SQLite przy INSERT ... SELECT ... ON CONFLICT
+    counted = select(
+        bindparam("owner_id", owner_id),
+        func.count(),
+        func.coalesce(func.sum(Task.is_completed), 0),
+    ).where(Task.owner_id == owner_id)
+    
+    if db.get_bind().dialect.name == "sqlite":
+        statement = sqlite.insert(TaskStats).from_select(columns, counted)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[TaskStats.owner_id],
+            set_={
+                "total": TaskStats.total + total,
+                "completed": TaskStats.completed + completed,
+            },
+        ))
+        return
+    
+    result = db.execute(
+        update(TaskStats)
+        .where(TaskStats.owner_id == owner_id)
+        .values(total=TaskStats.total + total, completed=TaskStats.completed + completed)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(TaskStats).from_select(columns, counted))
+
+
+def build_overdue_count_query(owner_id: int, now: datetime) -> Select:
+    """
+    Buduje zapytanie o liczbę zaległych zadań użytkownika.
+    
+    Zaległość zależy od bieżącego czasu, więc nie może być licznikiem;
+    zapytanie liczy tylko zakres indeksu (owner_id, is_completed, due_date).
+    """
+    return select(func.count()).select_from(Task).where(
+        Task.owner_id == owner_id,
+        Task.is_completed == False,  # noqa: E712
+        Task.due_date < now,
+    )
+
+
+def get_task_stats(db: Session, owner_id: int) -> TaskStatsSummary:
+    """
+    Pobiera statystyki zadań użytkownika.
+    
+    Liczba wszystkich i ukończonych zadań odczytywana jest z liczników,
+    a liczba zaległych z zakresu indeksu, więc koszt nie zależy od liczby
+    zadań użytkownika. Użytkownik bez wiersza liczników (np. przed pierwszym
+    uzgodnieniem) ma liczniki wyznaczane bezpośrednio z tabeli zadań.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        
+    Returns:
+        Liczby wszystkich, ukończonych, oczekujących i zaległych zadań.
+    """
+    counters = db.execute(
+        select(TaskStats.total, TaskStats.completed).where(TaskStats.owner_id == owner_id)
+    ).first()
+    if counters is None:
+        counters = db.execute(
+            select(func.count(), func.coalesce(func.sum(Task.is_completed), 0))
+            .where(Task.owner_id == owner_id)
+        ).first()
+    total, completed = counters
+    
+    return TaskStatsSummary(
+        total=total,
+        completed=completed,
+        pending=total - completed,
+        overdue=db.scalar(build_overdue_count_query(owner_id, datetime.utcnow())),
+    )
+
+
+def reconcile_task_stats(db: Session) -> int:
+    """
+    Wyznacza od nowa liczniki zadań wszystkich użytkowników.
+    
+    Naprawia ewentualne rozbieżności (np. po zmianach wykonanych z pominięciem
+    aplikacji) i tworzy liczniki dla zadań zapisanych przed ich wprowadzeniem.
+    Liczniki zastępowane są w jednej transakcji.
+    
+    Args:
+        db: Sesja bazy danych.
+        
+    Returns:
+        Liczba użytkowników, dla których zapisano liczniki.
+    """
+    db.execute(delete(TaskStats))
+    result = db.execute(insert(TaskStats).from_select(
+        [TaskStats.owner_id, TaskStats.total, TaskStats.completed],
+        select(Task.owner_id, func.count(), func.coalesce(func.sum(Task.is_completed), 0))
+        .where(Task.owner_id.is_not(None))
+        .group_by(Task.owner_id),
+    ))
+    db.commit()
+    
+    return result.rowcount
+
+
+def create_task(db: Session, owner_id: int, task_in: TaskCreate, commit: bool = True) -> Task:
+    """
+    Tworzy nowe zadanie użytkownika.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadania.
+        task_in: Dane nowego zadania.
+        commit: Czy zatwierdzić transakcję (False przy zapisach grupowych,
+            które zatwierdza koordynator).
+        
+    Returns:
+        Utworzone zadanie.
+    """
+    task = Task(**task_in.dict(), owner_id=owner_id)
+    
+    db.add(task)
+    db.flush()
+    bump_tasks_version(db, owner_id)
+    adjust_task_stats(db, owner_id, total=1, completed=int(task_in.is_completed))
+    if commit:
+        db.commit()
+    
+    return task
+
+
+def get_sort_key(task: Any, sort: TaskSort) -> List[Any]:
+    """
+    Zwraca wartości klucza sortowania zadania (do utworzenia kursora).
+    
+    Args:
+        task: Zadanie (obiekt ORM lub wiersz z kolumnami zadania).
+        sort: Porządek sortowania.
+        
+    Returns:
+        Lista [wartość kolumny sortowania, id].
+    """
+    column, _, _ = SORT_COLUMNS[sort]
+    return [getattr(task, column.key), task.id]
+
+
+def check_sort_key(sort: TaskSort, value: Any, last_id: Any) -> Tuple[Optional[datetime], int]:
+    """
+    Sprawdza typy wartości klucza sortowania odczytanych z kursora.
+    
+    Args:
+        sort: Porządek sortowania.
+        value: Wartość kolumny sortowania.
+        last_id: Identyfikator ostatniego zadania strony.
+        
+    Returns:
+        Pozycja (wartość, id) dla `build_tasks_query`.
+        
+    Raises:
+        ValueError: Jeśli wartości nie pasują do kolumny sortowania.
+    """
+    _, _, nullable = SORT_COLUMNS[sort]
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Identyfikator w kursorze musi być liczbą całkowitą.")
+    if not isinstance(value, datetime) and not (nullable and value is None):
+        raise ValueError("Nieprawidłowa wartość sortowania w kursorze.")
+    return value, last_id
+
+
+def _keyset_condition(column, descending: bool, nullable: bool, value: Any, last_id: int):
+    """
+    Buduje warunek "za pozycją (value, last_id)" dla sortowania po (column, id).
+    
+    SQLite umieszcza wartości NULL na początku przy sortowaniu rosnącym
+    i na końcu przy malejącym, więc dla kolumn opcjonalnych wartości NULL
+    obsługiwane są osobno.
+    """
+    if value is None:
+        if descending:
+            return and_(column.is_(None), Task.id < last_id)
+        return or_(and_(column.is_(None), Task.id > last_id), column.is_not(None))
+    if descending:
+        condition = tuple_(column, Task.id) < tuple_(value, last_id)
+        return or_(condition, column.is_(None)) if nullable else condition
+    return tuple_(column, Task.id) > tuple_(value, last_id)
+
+
+def build_tasks_query(
+    owner_id: int,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.created_at,
+    after: Optional[Tuple[Any, int]] = None,
+    ids: Optional[List[int]] = None,
+) -> Select:
+    """
+    Buduje zapytanie o listę zadań użytkownika z filtrami i sortowaniem.
+    
+    Args:
+        owner_id: Identyfikator właściciela zadań.
+        filters: Filtry listy zadań.
+        sort: Porządek sortowania.
+        after: Pozycja (wartość sortowania, id) ostatniego zadania poprzedniej strony.
+        ids: Identyfikatory zadań do pobrania (pobranie wielu zadań naraz).
+        
+    Returns:
+        Zapytanie SELECT bez limitu i przesunięcia.
+    """
+    query = select(Task).where(Task.owner_id == owner_id)
+    if ids is not None:
+        query = query.where(Task.id.in_(ids))
+    
+    if filters is not None:
+        if filters.completed is not None:
+            query = query.where(Task.is_completed == filters.completed)
+        if filters.overdue:
+            query = query.where(
+                Task.is_completed == False,  # noqa: E712
+                Task.due_date < datetime.utcnow(),
+            )
+        if filters.due_before is not None:
+            query = query.where(Task.due_date < filters.due_before)
+        if filters.due_after is not None:
+            query = query.where(Task.due_date >= filters.due_after)
+        if filters.created_after is not None:
+            query = query.where(Task.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            query = query.where(Task.created_at < filters.created_before)
+    
+    column, descending, nullable = SORT_COLUMNS[sort]
+    if after is not None:
+        # Stronicowanie kursorem: zakres indeksu zamiast odrzucania wcześniejszych wierszy
+        query = query.where(_keyset_condition(column, descending, nullable, *after))
+    
+    if descending:
+        return query.order_by(column.desc(), Task.id.desc())
+    return query.order_by(column, Task.id)
+
+
+def get_tasks(
+    db: Session,
+    owner_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[Any, int]] = None,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.created_at,
+    ids: Optional[List[int]] = None,
+) -> List[Task]:
+    """
+    Pobiera zadania użytkownika z filtrami i sortowaniem.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        skip: Liczba zadań do pominięcia (ignorowana, gdy podano `after`).
+        limit: Maksymalna liczba zadań do pobrania.
+        after: Pozycja (wartość sortowania, id) ostatniego zadania poprzedniej strony.
+        filters: Filtry listy zadań.
+        sort: Porządek sortowania.
+        ids: Identyfikatory zadań do pobrania (pobranie wielu zadań naraz).
+        
+    Returns:
+        Lista zadań.
+    """
+    query = build_tasks_query(owner_id, filters, sort, after, ids)
+    if after is None:
+        query = query.offset(skip)
+    
+    return db.scalars(query.limit(limit)).all()
+
+
+def get_task(db: Session, task_id: int, owner_id: int) -> Optional[Task]:
+    """
+    Pobiera zadanie o podanym identyfikatorze należące do użytkownika.
+    
+    Args:
+        db: Sesja bazy danych.
+        task_id: Identyfikator zadania.
+        owner_id: Identyfikator właściciela zadania.
+        
+    Returns:
+        Zadanie lub None, jeśli nie istnieje lub należy do innego użytkownika.
+    """
+    return db.scalars(
+        select(Task).where(Task.id == task_id, Task.owner_id == owner_id)
+    ).first()
+
+
+def get_task_rows(
+    db: Session,
+    owner_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[Any, int]] = None,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.created_at,
+    ids: Optional[List[int]] = None,
+) -> List[Row]:
+    """
+    Pobiera zadania użytkownika jako krotki kolumn zamiast obiektów ORM.
+    
+    Przyjmuje te same argumenty co `get_tasks`. Kolumny są w kolejności pól
+    schematu odpowiedzi, więc `row._asdict()` można serializować bezpośrednio.
+    
+    Returns:
+        Lista wierszy.
+    """
+    query = build_tasks_query(owner_id, filters, sort, after, ids)
+    if after is None:
+        query = query.offset(skip)
+    
+    return db.execute(query.with_only_columns(*TASK_COLUMNS).limit(limit)).all()
+
+
+def build_export_query(
+    owner_id: int,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.created_at,
+    batch_size: int = 500,
+) -> Select:
+    """
+    Buduje zapytanie eksportu wszystkich zadań użytkownika jako krotek kolumn.
+    
+    Zapytanie ma ustawione `yield_per`, więc wynik jest pobierany z kursora
+    porcjami zamiast wczytywania wszystkich wierszy do pamięci.
+    
+    Args:
+        owner_id: Identyfikator właściciela zadań.
+        filters: Filtry listy zadań.
+        sort: Porządek sortowania.
+        batch_size: Liczba wierszy w jednej porcji.
+        
+    Returns:
+        Zapytanie SELECT.
+    """
+    return (
+        build_tasks_query(owner_id, filters, sort)
+        .with_only_columns(*TASK_COLUMNS)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def iter_task_rows(
+    db: Session,
+    owner_id: int,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.created_at,
+    batch_size: int = 500,
+) -> Iterator[Sequence[Row]]:
+    """
+    Pobiera wszystkie zadania użytkownika porcjami wierszy.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        filters: Filtry listy zadań.
+        sort: Porządek sortowania.
+        batch_size: Liczba wierszy w jednej porcji.
+        
+    Yields:
+        Porcje wierszy w kolejności `sort`.
+    """
+    result = db.execute(build_export_query(owner_id, filters, sort, batch_size))
+    yield from result.partitions()
+
+
+def get_task_row(db: Session, task_id: int, owner_id: int) -> Optional[Row]:
+    """
+    Pobiera zadanie użytkownika jako krotkę kolumn zamiast obiektu ORM.
+    
+    Args:
+        db: Sesja bazy danych.
+        task_id: Identyfikator zadania.
+        owner_id: Identyfikator właściciela zadania.
+        
+    Returns:
+        Wiersz lub None, jeśli zadanie nie istnieje lub należy do innego użytkownika.
+    """
+    return db.execute(
+        select(*TASK_COLUMNS).where(Task.id == task_id, Task.owner_id == owner_id)
+    ).first()
+
+
+def search_tasks(
+    db: Session, owner_id: int, query: str, skip: int = 0, limit: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Wyszukuje zadania użytkownika zawierające wszystkie słowa zapytania.
+    
+    Przy dostępnym indeksie FTS5 wyniki są uszeregowane według trafności (BM25)
+    i zawierają tytuł z wyróżnionymi trafieniami oraz fragment opisu jako HTML
+    (tekst zadania zakodowany, trafienia w znacznikach <mark>). Bez indeksu
+    (inna baza lub SQLite bez FTS5) zadania wyszukiwane są przez LIKE, od najnowszych,
+    bez rankingu i wyróżnień.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        query: Tekst zapytania.
+        skip: Liczba wyników do pominięcia.
+        limit: Maksymalna liczba wyników.
+        
+    Returns:
+        Słowniki z kolumnami zadania oraz `rank`, `title_highlight` i `description_snippet`.
+    """
+    terms = search.query_terms(query)
+    if not terms:
+        return []
+    
+    if not search.is_search_index_available(db):
+        conditions = [
+            or_(
+                Task.title.contains(term, autoescape=True),
+                Task.description.contains(term, autoescape=True),
+            )
+            for term in terms
+        ]
+        rows = db.execute(
+            select(
+                *TASK_COLUMNS,
+                null().label("rank"),
+                null().label("title_highlight"),
+                null().label("description_snippet"),
+            )
+            .where(Task.owner_id == owner_id, *conditions)
+            .order_by(Task.created_at.desc(), Task.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return [row._asdict() for row in rows]
+    
+    return [
+        dict(
+            row._mapping,
+            title_highlight=search.render_highlight(row.title_highlight),
+            description_snippet=search.render_highlight(row.description_snippet),
+        )
+        for row in db.execute(build_search_query(owner_id, terms, skip, limit))
+    ]
+
+
+def build_search_query(owner_id: int, terms: List[str], skip: int = 0, limit: int = 20) -> Select:
+    """
+    Buduje zapytanie wyszukiwania pełnotekstowego w indeksie FTS5.
+    
+    Dopasowanie, ranking i stronicowanie wykonywane są w całości przez FTS5,
+    a funkcje wyróżniania trafień liczone są tylko dla wierszy zwracanej strony.
+    
+    Args:
+        owner_id: Identyfikator właściciela zadań.
+        terms: Słowa zapytania (niepusta lista z `search.query_terms`).
+        skip: Liczba wyników do pominięcia.
+        limit: Maksymalna liczba wyników.
+        
+    Returns:
+        Zapytanie SELECT zwracające kolumny zadania i pola wyniku wyszukiwania.
+    """
+    target = search.fts_match_target
+    matches = (
+        select(
+            search.tasks_fts.c.rowid.label("id"),
+            search.tasks_fts.c.rank.label("rank"),
+            func.highlight(
+                target, 0, search.HIGHLIGHT_MARKER_START, search.HIGHLIGHT_MARKER_END
+            ).label("title_highlight"),
+            func.nullif(func.snippet(
+                target, 1, search.HIGHLIGHT_MARKER_START, search.HIGHLIGHT_MARKER_END,
+                search.SNIPPET_ELLIPSIS, search.SNIPPET_TOKENS,
+            ), "").label("description_snippet"),
+        )
+        .where(target.match(search.build_match_expression(owner_id, terms)))
+        .order_by(search.tasks_fts.c.rank)
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    return (
+        select(
+            *TASK_COLUMNS,
+            matches.c.rank,
+            matches.c.title_highlight,
+            matches.c.description_snippet,
+        )
+        .select_from(matches)
+        .join(Task, Task.id == matches.c.id)
+        .where(Task.owner_id == owner_id)
+        .order_by(matches.c.rank, Task.id)
+    )
+
+
+def task_exists(db: Session, task_id: int) -> bool:
+    """
+    Sprawdza, czy zadanie o podanym identyfikatorze istnieje.
+    
+    Używane tylko po nieudanej operacji, aby odróżnić brak zadania (404)
+    od zadania innego użytkownika (403).
+    
+    Args:
+        db: Sesja bazy danych.
+        task_id: Identyfikator zadania.
+        
+    Returns:
+        True, jeśli zadanie istnieje.
+    """
+    return db.execute(select(Task.id).where(Task.id == task_id)).first() is not None
+
+
+def update_task(
+    db: Session, task_id: int, owner_id: int, task_in: TaskUpdate, commit: bool = True
+) -> Optional[Task]:
+    """
+    Aktualizuje zadanie użytkownika jednym zapytaniem UPDATE ... RETURNING.
+    
+    Przy zmianie stanu ukończenia najpierw wykonywany jest UPDATE tylko tej
+    kolumny z warunkiem na poprzedni stan, a licznik ukończonych zadań
+    zmieniany jest wyłącznie wtedy, gdy ten UPDATE zmienił wiersz (bez
+    osobnego SELECT).
+    Na bazach bez obsługi RETURNING zadanie jest aktualizowane, a następnie
+    pobierane osobnym zapytaniem.
+    
+    Args:
+        db: Sesja bazy danych.
+        task_id: Identyfikator zadania.
+        owner_id: Identyfikator właściciela zadania.
+        task_in: Dane do aktualizacji.
+        commit: Czy zatwierdzić transakcję (False przy zapisach grupowych).
+        
+    Returns:
+        Zaktualizowane zadanie lub None, jeśli nie istnieje lub należy do innego użytkownika.
+    """
+    update_data = task_in.dict(exclude_unset=True)
+    if not update_data:
+        return get_task(db, task_id, owner_id)
+    
+    # Zmiana stanu ukończenia dotyczy 0 wierszy, jeśli stan się nie zmienia
+    # lub zadanie nie istnieje albo należy do innego użytkownika
+    completed_delta = 0
+    if "is_completed" in update_data:
+        completed = bool(update_data["is_completed"])
+        changed = db.execute(
+            update(Task)
+            .where(
+                Task.id == task_id,
+                Task.owner_id == owner_id,
+                Task.is_completed.is_not(completed),
+            )
+            .values(is_completed=completed)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if changed:
+            completed_delta = 1 if completed else -1
+    
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .values(**update_data)
+    )
+    if db.get_bind().dialect.update_returning:
+        task = db.scalars(statement.returning(Task)).first()
+    else:
+        db.execute(statement)
+        task = get_task(db, task_id, owner_id)
+    if task is not None:
+        bump_tasks_version(db, owner_id)
+        adjust_task_stats(db, owner_id, completed=completed_delta)
+    if commit:
+        db.commit()
+    
+    return task
+
+
+def delete_task(db: Session, task_id: int, owner_id: int, commit: bool = True) -> bool:
+    """
+    Usuwa zadanie użytkownika jednym zapytaniem DELETE.
+    
+    Args:
+        db: Sesja bazy danych.
+        task_id: Identyfikator zadania.
+        owner_id: Identyfikator właściciela zadania.
+        commit: Czy zatwierdzić transakcję (False przy zapisach grupowych).
+        
+    Returns:
+        True, jeśli zadanie zostało usunięte.
+    """
+    statement = (
+        delete(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.delete_returning:
+        row = db.execute(statement.returning(Task.is_completed)).first()
+    else:
+        row = db.execute(
+            select(Task.is_completed).where(Task.id == task_id, Task.owner_id == owner_id)
+        ).first()
+        if row is not None:
+            db.execute(statement)
+    if row is not None:
+        bump_tasks_version(db, owner_id)
+        adjust_task_stats(db, owner_id, total=-1, completed=-int(row.is_completed))
+    if commit:
+        db.commit()
+    
+    return row is not None
+
+
+def _get_task_owners(db: Session, task_ids: List[int]) -> Dict[int, int]:
+    """Zwraca identyfikatory właścicieli istniejących zadań z podanej listy."""
+    if not task_ids:
+        return {}
+    rows = db.execute(select(Task.id, Task.owner_id).where(Task.id.in_(set(task_ids))))
+    return {task_id: owner_id for task_id, owner_id in rows}
+
+
+def _count_completed(db: Session, task_ids: Sequence[int]) -> int:
+    """Zwraca liczbę ukończonych zadań z podanej listy (do zmiany liczników)."""
+    return db.scalar(
+        select(func.count())
+        .select_from(Task)
+        .where(Task.id.in_(list(task_ids)), Task.is_completed == True)  # noqa: E712
+    )
+
+
+def _access_error(
+    index: int, task_id: int, owners: Dict[int, int], owner_id: int
+) -> Optional[TaskBulkItemResult]:
+    """Zwraca wynik błędu, jeśli zadanie nie istnieje lub należy do innego użytkownika."""
+    if task_id not in owners:
+        return TaskBulkItemResult(
+            index=index, id=task_id, status=status.HTTP_404_NOT_FOUND,
+            detail="Zadanie nie istnieje.",
+        )
+    if owners[task_id] != owner_id:
+        return TaskBulkItemResult(
+            index=index, id=task_id, status=status.HTTP_403_FORBIDDEN,
+            detail="Brak dostępu do tego zadania.",
+        )
+    return None
+
+
+def create_tasks(db: Session, owner_id: int, items: List[TaskCreate]) -> List[TaskBulkItemResult]:
+    """
+    Tworzy wiele zadań jednym wielowierszowym INSERT w jednej transakcji.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        items: Dane nowych zadań.
+        
+    Returns:
+        Wyniki dla kolejnych pozycji żądania (pusta lista dla pustego żądania).
+    """
+    # INSERT z pustą listą parametrów wstawiłby jeden wiersz wartości domyślnych
+    if not items:
+        return []
+    
+    rows = [dict(item.dict(), owner_id=owner_id) for item in items]
+    tasks = db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True), rows
+    ).all()
+    
+    results = [
+        TaskBulkItemResult(
+            index=index, id=task.id, status=status.HTTP_201_CREATED,
+            task=TaskSchema.from_orm(task),
+        )
+        for index, task in enumerate(tasks)
+    ]
+    bump_tasks_version(db, owner_id)
+    adjust_task_stats(
+        db, owner_id, total=len(tasks), completed=sum(task.is_completed for task in tasks)
+    )
+    db.commit()
+    
+    return results
+
+
+def import_tasks(db: Session, owner_id: int, items: List[TaskCreate]) -> int:
+    """
+    Zapisuje porcję importowanych zadań w jednej transakcji.
+    
+    W przeciwieństwie do `create_tasks` nie zwraca utworzonych wierszy,
+    więc INSERT wykonywany jest jako executemany bez RETURNING.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        items: Zwalidowane dane zadań.
+        
+    Returns:
+        Liczba utworzonych zadań.
+    """
+    db.execute(insert(Task), [dict(item.dict(), owner_id=owner_id) for item in items])
+    bump_tasks_version(db, owner_id)
+    adjust_task_stats(
+        db, owner_id, total=len(items), completed=sum(item.is_completed for item in items)
+    )
+    db.commit()
+    
+    return len(items)
+
+
+def update_tasks(
+    db: Session, owner_id: int, items: List[TaskBulkUpdateItem]
+) -> List[TaskBulkItemResult]:
+    """
+    Aktualizuje wiele zadań w jednej transakcji.
+    
+    Pozycje z tym samym zestawem zmienianych pól wykonywane są jednym
+    UPDATE typu executemany, ograniczonym do zadań właściciela.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        items: Identyfikatory zadań wraz z danymi do aktualizacji.
+        
+    Returns:
+        Wyniki dla kolejnych pozycji żądania.
+    """
+    owners = _get_task_owners(db, [item.id for item in items])
+    results: List[Optional[TaskBulkItemResult]] = [None] * len(items)
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    updated: Dict[int, int] = {}
+    
+    for index, item in enumerate(items):
+        error = _access_error(index, item.id, owners, owner_id)
+        if error is None and item.id in updated:
+            error = TaskBulkItemResult(
+                index=index, id=item.id, status=status.HTTP_400_BAD_REQUEST,
+                detail="Zadanie występuje w żądaniu więcej niż raz.",
+            )
+        if error is not None:
+            results[index] = error
+            continue
+        
+        update_data = item.dict(exclude_unset=True, exclude={"id"})
+        params = {f"v_{field}": value for field, value in update_data.items()}
+        groups.setdefault(tuple(sorted(update_data)), []).append({"b_id": item.id, **params})
+        updated[item.id] = index
+    
+    # Liczba ukończonych zadań przed zmianą, jeśli żądanie zmienia stan ukończenia
+    completed_before = None
+    if any("is_completed" in fields for fields in groups):
+        completed_before = _count_completed(db, list(updated))
+    
+    table = Task.__table__
+    for fields, params in groups.items():
+        if not fields:
+            continue
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.owner_id == owner_id)
+            .values({field: bindparam(f"v_{field}") for field in fields})
+        )
+        db.execute(statement, params)
+    
+    if updated:
+        tasks = db.scalars(
+            select(Task)
+            .where(Task.id.in_(list(updated)))
+            .execution_options(populate_existing=True)
+        )
+        completed_after = 0
+        for task in tasks:
+            index = updated[task.id]
+            results[index] = TaskBulkItemResult(
+                index=index, id=task.id, status=status.HTTP_200_OK,
+                task=TaskSchema.from_orm(task),
+            )
+            completed_after += task.is_completed
+        bump_tasks_version(db, owner_id)
+        if completed_before is not None:
+            adjust_task_stats(db, owner_id, completed=completed_after - completed_before)
+    db.commit()
+    
+    return results
+
+
+def delete_tasks(db: Session, owner_id: int, task_ids: List[int]) -> List[TaskBulkItemResult]:
+    """
+    Usuwa wiele zadań jednym DELETE ograniczonym do zadań właściciela.
+    
+    Args:
+        db: Sesja bazy danych.
+        owner_id: Identyfikator właściciela zadań.
+        task_ids: Identyfikatory zadań do usunięcia.
+        
+    Returns:
+        Wyniki dla kolejnych pozycji żądania.
+    """
+    owners = _get_task_owners(db, task_ids)
+    results: List[TaskBulkItemResult] = []
+    deleted = set()
+    
+    for index, task_id in enumerate(task_ids):
+        error = _access_error(index, task_id, owners, owner_id)
+        if error is None and task_id in deleted:
+            error = TaskBulkItemResult(
+                index=index, id=task_id, status=status.HTTP_400_BAD_REQUEST,
+                detail="Zadanie występuje w żądaniu więcej niż raz.",
+            )
+        if error is not None:
+            results.append(error)
+            continue
+        deleted.add(task_id)
+        results.append(
+            TaskBulkItemResult(index=index, id=task_id, status=status.HTTP_204_NO_CONTENT)
+        )
+    
+    if deleted:
+        completed = _count_completed(db, list(deleted))
+        db.execute(
+            delete(Task)
+            .where(Task.owner_id == owner_id, Task.id.in_(deleted))
+            .execution_options(synchronize_session=False)
+        )
+        bump_tasks_version(db, owner_id)
+        adjust_task_stats(db, owner_id, total=-len(deleted), completed=-completed)
+    db.commit()
+    
+    return results
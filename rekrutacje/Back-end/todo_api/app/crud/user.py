@@ -0,0 +1,86 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+
+def get_user(db: Session, user_id: int) -> Optional[User]:
+    """
+    Pobiera użytkownika po kluczu głównym.
+    
+    Użytkownik załadowany już w sesji zwracany jest z mapy tożsamości
+    bez zapytania do bazy.
+    
+    Args:
+        db: Sesja bazy danych.
+        user_id: Identyfikator użytkownika.
+        
+    Returns:
+        Obiekt użytkownika lub None.
+    """
+    return db.get(User, user_id)
+
+
+def get_user_by_username(db: Session, username: str) -> Optional[User]:
+    """
+    Pobiera użytkownika o podanej nazwie.
+    
+    Args:
+        db: Sesja bazy danych.
+        username: Nazwa użytkownika.
+        
+    Returns:
+        Obiekt użytkownika lub None.
+    """
+    return db.query(User).filter(User.username == username).first()
+
+
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """
+    Pobiera użytkownika o podanym adresie email.
+    
+    Args:
+        db: Sesja bazy danych.
+        email: Adres email.
+        
+    Returns:
+        Obiekt użytkownika lub None.
+    """
+    return db.query(User).filter(User.email == email).first()
+
+
+def create_user(db: Session, user: User) -> User:
+    """
+    Zapisuje nowego użytkownika w bazie danych.
+    
+    Args:
+        db: Sesja bazy danych.
+        user: Obiekt użytkownika do zapisania.
+        
+    Returns:
+        Zapisany użytkownik.
+    """
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    
+    return user
+
+
+def update_password_hash(db: Session, user: User, hashed_password: str) -> User:
+    """
+    Zapisuje nowy hash hasła użytkownika (np. po zmianie ustawień hashowania).
+    
+    Args:
+        db: Sesja bazy danych.
+        user: Użytkownik.
+        hashed_password: Nowy hash hasła.
+        
+    Returns:
+        Zaktualizowany użytkownik.
+    """
+    user.hashed_password = hashed_password
+    db.commit()
+    
+    return user
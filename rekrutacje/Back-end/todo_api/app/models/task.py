@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -20,4 +20,19 @@ class Task(Base):
     
     # Klucz obcy i relacja z użytkownikiem
     owner_id = Column(Integer, ForeignKey("users.id"))
-    owner = relationship("User", back_populates="tasks") 
\ No newline at end of file
+    owner = relationship("User", back_populates="tasks")
+    
+    __table_args__ = (
+        # Indeksy złożone dla filtrowania, sortowania i stronicowania kursorem
+        # w obrębie właściciela (SQLite dopisuje id jako ostatnią kolumnę indeksu)
+        Index("ix_tasks_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_tasks_owner_id_due_date_id", "owner_id", "due_date", "id"),
+        Index(
+            "ix_tasks_owner_id_is_completed_due_date",
+            "owner_id", "is_completed", "due_date",
+        ),
+        Index(
+            "ix_tasks_owner_id_is_completed_created_at",
+            "owner_id", "is_completed", "created_at",
+        ),
+    ) 
\ No newline at end of file
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+class TaskStats(Base):
+    """Model liczników zadań użytkownika, aktualizowanych przy każdym zapisie zadań."""
+    
+    __tablename__ = "task_stats"
+    
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+class TaskListVersion(Base):
+    """Model wersji listy zadań użytkownika, zwiększanej przy każdym zapisie zadań."""
+    
+    __tablename__ = "task_list_versions"
+    
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,14 +1,24 @@
+import math
+import time
 from datetime import timedelta
-from typing import Any
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from jose import JWTError
+from sqlalchemy import event
 
+from app.core import metrics
+from app.core.cache import TokenCache, UserSnapshot
 from app.core.config import settings
-from app.core.database import get_db
-from app.core.security import ALGORITHM, create_access_token, verify_password
+from app.core.database import DbSession, get_session, run_db
+from app.core.ratelimit import InMemoryRateLimitBackend, RateLimiter, RateLimitRule
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    verify_and_update_password_async,
+)
+from app.crud.user import get_user, get_user_by_username, update_password_hash
 from app.models.user import User
 from app.schemas.user import Token, TokenData
 
@@ -16,11 +26,97 @@ router = APIRouter(tags=["auth"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
 
+# Pamięć podręczna zweryfikowanych tokenów i migawek użytkowników
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
 
-def authenticate_user(db: Session, username: str, password: str) -> Any:
+
+# Ogranicznik żądań dla endpointów wykonujących bcrypt; przy kilku procesach
+# roboczych `rate_limiter.backend` można zastąpić magazynem współdzielonym
+rate_limiter = RateLimiter(
+    InMemoryRateLimitBackend(),
+    rules={
+        "ip": RateLimitRule(settings.RATE_LIMIT_IP_BURST, settings.RATE_LIMIT_IP_PER_MINUTE),
+        "username": RateLimitRule(
+            settings.RATE_LIMIT_USERNAME_BURST, settings.RATE_LIMIT_USERNAME_PER_MINUTE
+        ),
+    },
+)
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    """Zwraca adres IP klienta (z X-Forwarded-For tylko przy zaufanym proxy)."""
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+async def check_rate_limit(request: Request, username: Optional[str] = None) -> None:
+    """
+    Sprawdza limity żądań dla adresu IP klienta i nazwy użytkownika.
+    
+    Wywoływane przed kosztownym hashowaniem lub weryfikacją hasła. Kubełek
+    nazwy użytkownika jest osobny dla każdego adresu IP, więc nieudane próby
+    z jednego adresu nie blokują logowania właściciela konta z innego.
+    
+    Args:
+        request: Żądanie HTTP.
+        username: Nazwa użytkownika, której dotyczy żądanie.
+        
+    Raises:
+        HTTPException: 429 z nagłówkiem Retry-After, jeśli limit został przekroczony.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    
+    client_ip = get_client_ip(request)
+    rule, wait = await rate_limiter.check(
+        ip=client_ip, username=f"{username.lower()}|{client_ip}" if username else None
+    )
+    if rule is not None:
+        metrics.RATE_LIMIT_REJECTIONS.inc(labels=(rule,))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Zbyt wiele żądań. Spróbuj ponownie później.",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+
+def _token_cache_metrics() -> List[str]:
+    """Zwraca statystyki pamięci podręcznej tokenów w formacie metryk."""
+    stats = token_cache.stats()
+    return metrics.sample_lines(
+        "token_cache_lookups_total", "Liczba odczytów pamięci podręcznej tokenów.", "counter",
+        {("hit",): stats["hits"], ("miss",): stats["misses"]}, ("result",),
+    ) + metrics.sample_lines(
+        "token_cache_entries", "Liczba tokenów w pamięci podręcznej.", "gauge",
+        {(): stats["size"]},
+    )
+
+
+metrics.REGISTRY.add_collector(_token_cache_metrics)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    """Usuwa z pamięci podręcznej tokeny użytkownika, który został zmieniony lub usunięty."""
+    token_cache.invalidate_user(target.id)
+
+
+async def authenticate_user(db: DbSession, username: str, password: str) -> Any:
     """
     Uwierzytelnia użytkownika na podstawie nazwy użytkownika i hasła.
     
+    Zapytanie do bazy wykonywane jest przez `run_db`, a weryfikacja hasła
+    w ograniczonej puli wykonawców, więc pętla zdarzeń pozostaje responsywna.
+    Hash utworzony innym schematem lub z niższym kosztem niż w ustawieniach
+    jest po udanym logowaniu zastępowany nowym.
+    
     Args:
         db: Sesja bazy danych.
         username: Nazwa użytkownika.
@@ -29,68 +125,161 @@ def authenticate_user(db: Session, username: str, password: str) -> Any:
     Returns:
         Obiekt użytkownika, jeśli uwierzytelnienie się powiedzie, None w przeciwnym wypadku.
     """
-    user = db.query(User).filter(User.username == username).first()
+    user = await run_db(db, get_user_by_username, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash is not None:
+        user = await run_db(db, update_password_hash, user, new_hash)
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Nieprawidłowe dane uwierzytelniające",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _inactive_user_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Nieaktywny użytkownik"
+    )
+
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    """
+    Dekoduje token JWT i sprawdza, czy zawiera identyfikację użytkownika.
+    
+    Raises:
+        HTTPException: 401, jeśli token jest nieprawidłowy.
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+async def _load_token_user(db: DbSession, payload: Dict[str, Any]) -> User:
+    """
+    Pobiera użytkownika wskazanego w tokenie i sprawdza, czy jest aktywny.
+    
+    Tokeny z identyfikatorem `uid` odczytywane są po kluczu głównym (z mapy
+    tożsamości sesji, jeśli użytkownik jest już w niej załadowany), starsze
+    tokeny po nazwie użytkownika.
+    
+    Raises:
+        HTTPException: Jeśli użytkownik nie istnieje lub jest nieaktywny.
+    """
+    user_id = payload.get("uid")
+    if user_id is not None:
+        user = await run_db(db, get_user, user_id)
+    else:
+        user = await run_db(db, get_user_by_username, TokenData(username=payload["sub"]).username)
+    if user is None:
+        raise _credentials_exception()
+    if not user.is_active:
+        raise _inactive_user_exception()
     return user
 
 
 async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+    db: DbSession = Depends(get_session), token: str = Depends(oauth2_scheme)
+) -> UserSnapshot:
     """
     Pobiera aktualnego użytkownika na podstawie tokenu JWT.
     
+    Zweryfikowane tokeny są przechowywane w pamięci podręcznej, więc kolejne
+    zapytania z tym samym tokenem nie dekodują go ponownie i nie odpytują bazy.
+    
     Args:
         db: Sesja bazy danych.
         token: Token JWT.
         
     Returns:
-        Obiekt użytkownika.
+        Migawka danych użytkownika.
         
     Raises:
         HTTPException: Jeśli token jest nieprawidłowy lub użytkownik nie istnieje.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Nieprawidłowe dane uwierzytelniające",
-        headers={"WWW-Authenticate": "Bearer"},
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user
+    
+    payload = _decode_token(token)
+    snapshot = UserSnapshot.from_user(await _load_token_user(db, payload))
+    token_cache.set(token, payload, snapshot)
+    
+    return snapshot
+
+
+def _claims_are_fresh(payload: Dict[str, Any]) -> bool:
+    """Sprawdza, czy dane użytkownika w tokenie są na tyle świeże, by im zaufać bez odczytu bazy."""
+    issued_at = payload.get("iat")
+    return (
+        payload.get("uid") is not None
+        and issued_at is not None
+        and time.time() - issued_at <= settings.AUTH_CLAIMS_MAX_AGE_SECONDS
     )
+
+
+async def get_current_user_id(
+    db: DbSession = Depends(get_session), token: str = Depends(oauth2_scheme)
+) -> int:
+    """
+    Zwraca identyfikator aktualnego użytkownika bez odczytu tabeli `users`.
     
-    try:
-        # Dekodowanie tokenu
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
+    Tokeny zawierają identyfikator (`uid`) i stan aktywności (`act`) użytkownika
+    z chwili logowania, więc dla świeżych tokenów wystarcza weryfikacja podpisu.
+    Tokeny starsze niż `AUTH_CLAIMS_MAX_AGE_SECONDS` (oraz tokeny bez tych pól)
+    weryfikowane są w bazie, a wynik trafia do pamięci podręcznej unieważnianej
+    przy zmianie użytkownika, więc usunięty lub dezaktywowany użytkownik traci
+    dostęp po tym czasie, a nie dopiero po wygaśnięciu tokenu. Przy włączonym
+    `AUTH_VERIFY_USER_ON_REQUEST` baza odpytywana jest dla każdego tokenu.
+    
+    Args:
+        db: Sesja bazy danych (używana tylko, gdy potrzebny jest odczyt użytkownika).
+        token: Token JWT.
         
-    # Pobranie użytkownika z bazy danych
-    user = db.query(User).filter(User.username == token_data.username).first()
-    if user is None:
-        raise credentials_exception
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Nieaktywny użytkownik"
-        )
+    Returns:
+        Identyfikator użytkownika.
         
-    return user
+    Raises:
+        HTTPException: Jeśli token jest nieprawidłowy lub użytkownik jest nieaktywny.
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user.id
+    
+    payload = _decode_token(token)
+    if settings.AUTH_VERIFY_USER_ON_REQUEST or not _claims_are_fresh(payload):
+        user = await _load_token_user(db, payload)
+        token_cache.set(token, payload, UserSnapshot.from_user(user))
+        return user.id
+    
+    if not payload.get("act", False):
+        raise _inactive_user_exception()
+    return payload["uid"]
 
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: DbSession = Depends(get_session),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     Loguje użytkownika i zwraca token dostępu.
     
     Args:
+        request: Żądanie HTTP (adres klienta dla ogranicznika żądań).
         db: Sesja bazy danych.
         form_data: Dane formularza logowania.
         
@@ -98,9 +287,11 @@ async def login_for_access_token(
         Token dostępu.
         
     Raises:
-        HTTPException: Jeśli dane logowania są nieprawidłowe.
+        HTTPException: Jeśli dane logowania są nieprawidłowe lub przekroczono limit żądań.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    await check_rate_limit(request, form_data.username)
+    
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -111,7 +302,8 @@ async def login_for_access_token(
     # Utworzenie tokenu dostępu
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "uid": user.id, "act": user.is_active},
+        expires_delta=access_token_expires,
     )
     
     return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
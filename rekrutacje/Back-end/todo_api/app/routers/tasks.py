@@ -1,23 +1,171 @@
-from typing import Any, List
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, TypeVar
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from app.core.database import get_db
-from app.models.task import Task
-from app.models.user import User
-from app.routers.auth import get_current_user
+from app.core.config import settings
+from app.core.database import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    DbSession,
+    ReadSessionLocal,
+    SessionLocal,
+    get_read_session,
+    get_session,
+    run_db,
+)
+from app.core.etag import etag_matches, make_etag
+from app.core.export import EXPORT_MEDIA_TYPES, encode_header, encode_rows
+from app.core.group_commit import WriteCoordinator
+from app.core.importer import iter_records, validation_detail
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.responses import FastJSONResponse
+from app.crud import task as crud_task
+from app.routers.auth import get_current_user_id
 from app.schemas.task import Task as TaskSchema
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import (
+    TaskBulkItemResult,
+    TaskBulkResult,
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskFileFormat,
+    TaskFilter,
+    TaskImportError,
+    TaskImportResult,
+    TaskSearchResult,
+    TaskSort,
+    TaskStatsSummary,
+    TaskUpdate,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Koordynator zapisów grupowych dla pojedynczych zapisów zadań (tylko przy włączonym
+# GROUP_COMMIT_ENABLED; w przeciwnym razie zapis wykonywany jest w sesji żądania)
+write_coordinator = WriteCoordinator(
+    AsyncSessionLocal if settings.ASYNC_DATABASE else SessionLocal,
+    window_seconds=settings.GROUP_COMMIT_WINDOW_MS / 1000,
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+) if settings.GROUP_COMMIT_ENABLED else None
+
+
+def check_bulk_size(count: int) -> None:
+    """
+    Sprawdza, czy liczba pozycji żądania zbiorczego mieści się w limicie.
+    
+    Raises:
+        HTTPException: Jeśli żądanie zawiera zbyt wiele pozycji.
+    """
+    if count > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Żądanie może zawierać najwyżej {settings.BULK_MAX_ITEMS} pozycji."
+        )
+
+
+async def run_write(db: DbSession, fn: Callable[..., T], *args: Any) -> T:
+    """
+    Wykonuje zapis zadania przez koordynator zapisów grupowych lub w sesji żądania.
+    
+    Args:
+        db: Sesja bazy danych żądania (używana bez koordynatora).
+        fn: Funkcja zapisu z `app.crud` przyjmująca parametr `commit`.
+        
+    Returns:
+        Wynik funkcji po zatwierdzeniu zapisu.
+    """
+    if write_coordinator is not None:
+        return await write_coordinator.submit(fn, *args)
+    return await run_db(db, fn, *args)
+
+
+async def task_access_error(db: DbSession, task_id: int) -> HTTPException:
+    """
+    Zwraca błąd dla zadania, którego nie udało się odczytać ani zmienić.
+    
+    Zapytania są ograniczone do zadań właściciela, więc dopiero po niepowodzeniu
+    sprawdzane jest, czy zadanie w ogóle istnieje.
+    
+    Returns:
+        Wyjątek 404, jeśli zadanie nie istnieje, lub 403, jeśli należy do innego użytkownika.
+    """
+    # Sprawdzenie, czy zadanie istnieje
+    if not await run_db(db, crud_task.task_exists, task_id):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Zadanie nie istnieje."
+        )
+        
+    # Zadanie istnieje, ale należy do innego użytkownika
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Brak dostępu do tego zadania."
+    )
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Obsługuje warunkowe żądanie GET dla zasobu o podanym znaczniku ETag.
+    
+    Args:
+        request: Żądanie HTTP z opcjonalnym nagłówkiem If-None-Match.
+        response: Odpowiedź HTTP, do której dodawane są nagłówki walidacji.
+        etag: Aktualny znacznik zasobu.
+        
+    Returns:
+        Odpowiedź 304, jeśli klient posiada aktualną wersję, w przeciwnym razie None.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+
+async def reconcile_stats_periodically(interval: float) -> None:
+    """
+    Zadanie w tle uzgadniające liczniki statystyk zadań z tabelą zadań.
+    
+    Pierwsze uzgodnienie wykonywane jest razem z `init_db` (w `main` lub raz
+    w `serve.py`), więc zadanie czeka `interval` sekund przed każdym kolejnym.
+    Uzgodnienie przebudowuje całą tabelę liczników, dlatego zadanie powinno
+    działać w jednym procesie (`serve.py` uruchamia je w procesie nadrzędnym).
+    Błąd pojedynczego uzgodnienia jest logowany i nie przerywa zadania.
+    
+    Args:
+        interval: Odstęp między uzgodnieniami w sekundach.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            with SessionLocal() as db:
+                owners = await run_db(db, crud_task.reconcile_task_stats)
+            logger.info("Uzgodniono liczniki zadań %d użytkowników", owners)
+        except Exception:
+            logger.exception("Uzgodnienie liczników zadań nie powiodło się")
+
+
+def bulk_report(results: List[TaskBulkItemResult]) -> TaskBulkResult:
+    """Buduje raport operacji zbiorczej z wyników pojedynczych pozycji."""
+    succeeded = sum(1 for result in results if result.status < 400)
+    return TaskBulkResult(
+        succeeded=succeeded, failed=len(results) - succeeded, results=results
+    )
+
 
 @router.post("", response_model=TaskSchema, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_in: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id),
 ) -> Any:
     """
     Tworzy nowe zadanie dla zalogowanego użytkownika.
@@ -25,68 +173,399 @@ def create_task(
     Args:
         task_in: Dane nowego zadania.
         db: Sesja bazy danych.
-        current_user: Aktualnie zalogowany użytkownik.
+        user_id: Identyfikator zalogowanego użytkownika.
         
     Returns:
         Utworzone zadanie.
     """
-    # Utworzenie nowego zadania
-    task = Task(
-        **task_in.dict(),
-        owner_id=current_user.id
-    )
-    
-    # Zapisanie zadania w bazie danych
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    
-    return task
+    # Utworzenie i zapisanie nowego zadania
+    return await run_write(db, crud_task.create_task, user_id, task_in)
 
 
 @router.get("", response_model=List[TaskSchema])
-def read_tasks(
+async def read_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    after: Optional[str] = None,
+    sort: TaskSort = TaskSort.created_at,
+    filters: TaskFilter = Depends(),
+    ids: Optional[List[int]] = Query(None),
+    db: DbSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id),
 ) -> Any:
     """
-    Pobiera wszystkie zadania zalogowanego użytkownika.
+    Pobiera zadania zalogowanego użytkownika z opcjonalnymi filtrami.
+    
+    Obsługuje dwa tryby stronicowania: `skip`/`limit` (dla zgodności wstecznej)
+    oraz kursor `after`. Kursor kolejnej strony zwracany jest w nagłówku
+    `X-Next-Cursor`, gdy strona jest pełna. Kursor jest ważny tylko
+    dla porządku sortowania, w którym został utworzony.
+    
+    Odpowiedź zawiera znacznik ETag wyznaczony z wersji listy zadań użytkownika
+    i parametrów zapytania; żądanie z aktualnym If-None-Match otrzymuje 304
+    bez pobierania zadań. Filtr `overdue` zależy od bieżącego czasu,
+    więc takie odpowiedzi nie są oznaczane znacznikiem.
     
     Args:
+        request: Żądanie HTTP (parametry zapytania i nagłówek If-None-Match).
+        response: Odpowiedź HTTP, do której dodawane są nagłówki kursora i ETag.
         skip: Liczba zadań do pominięcia.
         limit: Maksymalna liczba zadań do pobrania.
-        db: Sesja bazy danych.
-        current_user: Aktualnie zalogowany użytkownik.
+        after: Kursor z nagłówka `X-Next-Cursor` poprzedniej strony.
+        sort: Porządek sortowania (prefiks "-" oznacza malejący).
+        filters: Filtry stanu ukończenia, terminu i daty utworzenia.
+        ids: Identyfikatory zadań do pobrania jednym zapytaniem (`?ids=1&ids=2`).
+        db: Sesja bazy danych tylko do odczytu.
+        user_id: Identyfikator zalogowanego użytkownika.
         
     Returns:
         Lista zadań.
+        
+    Raises:
+        HTTPException: Jeśli kursor jest nieprawidłowy lub podano zbyt wiele identyfikatorów.
     """
-    tasks = (
-        db.query(Task)
-        .filter(Task.owner_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    if ids is not None:
+        check_bulk_size(len(ids))
+    
+    position = None
+    if after is not None:
+        try:
+            cursor_sort, value, last_id = decode_cursor(after, size=3)
+            if cursor_sort != sort.value:
+                raise ValueError("Kursor utworzono dla innego sortowania.")
+            position = crud_task.check_sort_key(sort, value, last_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Nieprawidłowy kursor stronicowania."
+            )
+    
+    # Wersja listy zmienia się przy każdym zapisie, więc jest tańsza niż odczyt zadań
+    if not filters.overdue:
+        version = await run_db(db, crud_task.get_tasks_version, user_id)
+        etag = make_etag(user_id, version, request.url.query)
+        cached = not_modified(request, response, etag)
+        if cached is not None:
+            return cached
+    
+    # Szybka ścieżka pobiera krotki kolumn i pomija walidację modeli Pydantic
+    fetch = crud_task.get_task_rows if settings.FAST_JSON_RESPONSES else crud_task.get_tasks
+    tasks = await run_db(
+        db, fetch, user_id, skip, limit,
+        after=position, filters=filters, sort=sort, ids=ids,
     )
     
+    # Kursor kolejnej strony wskazuje na ostatnie zwrócone zadanie
+    if tasks and len(tasks) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            [sort.value, *crud_task.get_sort_key(tasks[-1], sort)]
+        )
+    
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(
+            [row._asdict() for row in tasks], headers=dict(response.headers)
+        )
     return tasks
 
 
+@router.post("/bulk", response_model=TaskBulkResult)
+async def create_tasks_bulk(
+    items: List[TaskCreate],
+    db: DbSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id),
+) -> Any:
+    """
+    Tworzy wiele zadań w jednej transakcji.
+    
+    Args:
+        items: Dane nowych zadań.
+        db: Sesja bazy danych.
+        user_id: Identyfikator zalogowanego użytkownika.
+        
+    Returns:
+        Raport z wynikiem dla każdej pozycji.
+    """
+    check_bulk_size(len(items))
+    results = await run_db(db, crud_task.create_tasks, user_id, items)
+    
+    return bulk_report(results)
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def update_tasks_bulk(
+    items: List[TaskBulkUpdateItem],
+    db: DbSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id),
+) -> Any:
+    """
+    Aktualizuje wiele zadań w jednej transakcji.
+    
+    Zadania nieistniejące lub należące do innego użytkownika są pomijane
+    i oznaczane w raporcie kodem 404 lub 403.
+    
+    Args:
+        items: Identyfikatory zadań wraz z danymi do aktualizacji.
+        db: Sesja bazy danych.
+        user_id: Identyfikator zalogowanego użytkownika.
+        
+    Returns:
+        Raport z wynikiem dla każdej pozycji.
+    """
+    check_bulk_size(len(items))
+    results = await run_db(db, crud_task.update_tasks, user_id, items)
+    
+    return bulk_report(results)
+
+
+@router.delete("/bulk", response_model=TaskBulkResult)
+async def delete_tasks_bulk(
+    ids: List[int],
+    db: DbSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id),
+) -> Any:
+    """
+    Usuwa wiele zadań w jednej transakcji.
+    
+    Zadania nieistniejące lub należące do innego użytkownika są pomijane
+    i oznaczane w raporcie kodem 404 lub 403.
+    
+    Args:
+        ids: Identyfikatory zadań do usunięcia.
+        db: Sesja bazy danych.
+        user_id: Identyfikator zalogowanego użytkownika.
+        
+    Returns:
+        Raport z wynikiem dla każdej pozycji.
+    """
+    check_bulk_size(len(ids))
+    results = await run_db(db, crud_task.delete_tasks, user_id, ids)
+    
+    return bulk_report(results)
+
+
+def stream_export(
+    export_format: TaskFileFormat, owner_id: int, filters: TaskFilter, sort: TaskSort
+) -> Iterator[bytes]:
+    """
+    Generuje plik eksportu porcjami, czytając zadania z kursora bazy danych.
+    
+    Generator otwiera własną sesję tylko do odczytu, ponieważ działa po zakończeniu
+    obsługi endpointu; `StreamingResponse` wywołuje go w puli wątków.
+    """
+    yield encode_header(export_format, list(TaskSchema.__fields__))
+    with ReadSessionLocal() as db:
+        for rows in crud_task.iter_task_rows(
+            db, owner_id, filters, sort, settings.EXPORT_BATCH_SIZE
+        ):
+            yield encode_rows(export_format, rows)
+
+
+async def stream_export_async(
+    export_format: TaskFileFormat, owner_id: int, filters: TaskFilter, sort: TaskSort
+) -> AsyncIterator[bytes]:
+    """Odpowiednik `stream_export` dla trybu asynchronicznego (`AsyncSession.stream`)."""
+    yield encode_header(export_format, list(TaskSchema.__fields__))
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream(crud_task.build_export_query(
+            owner_id, filters, sort, settings.EXPORT_BATCH_SIZE
+        ))
+        async for rows in result.partitions():
+            yield encode_rows(export_format, rows)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}
+        }
+    },
+)
+async def export_tasks(
+    export_format: TaskFileFormat = Query(TaskFileFormat.ndjson, alias="format"),
+    sort: TaskSort = TaskSort.created_at,
+    filters: TaskFilter = Depends(),
+    user_id: int = Depends(get_current_user_id),
+) -> StreamingResponse:
+    """
+    Eksportuje wszystkie zadania zalogowanego użytkownika jako NDJSON lub CSV.
+    
+    Odpowiedź jest strumieniowana: zadania pobierane są z bazy porcjami
+    `EXPORT_BATCH_SIZE` wierszy i wysyłane od razu, więc zużycie pamięci
+    nie zależy od liczby zadań. Kolumny odpowiadają polom schematu zadania.
+    
+    Args:
+        export_format: Format pliku (`ndjson` lub `csv`).
+        sort: Porządek sortowania.
+        filters: Filtry stanu ukończenia, terminu i daty utworzenia.
+        user_id: Identyfikator zalogowanego użytkownika.
+        
+    Returns:
+        Strumieniowana odpowiedź z plikiem eksportu.
+    """
+    stream = stream_export_async if settings.ASYNC_DATABASE else stream_export
+    return StreamingResponse(
+        stream(export_format, user_id, filters, sort),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'
+        },
+    )
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    file_format: TaskFileFormat = Query(TaskFileFormat.ndjson, alias="format"),
+    db: DbSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id),
+) -> Any:
+    """
+    Importuje zadania z pliku NDJSON lub CSV przesłanego w treści żądania.
+    
+    Treść jest parsowana przyrostowo w trakcie odbierania, a poprawne rekordy
+    zapisywane w transakcjach po `IMPORT_BATCH_SIZE` zadań, więc zużycie pamięci
+    nie zależy od rozmiaru pliku. Błędne rekordy są pomijane i zgłaszane
+    w raporcie z numerem linii (najwyżej `IMPORT_MAX_ERRORS` pozycji).
+    Plik CSV musi zaczynać się wierszem nagłówka z nazwami pól zadania;
+    nieznane kolumny, np. `id` z pliku eksportu, są ignorowane.
+    
+    Args:
+        request: Żądanie HTTP, którego treść jest odczytywana strumieniowo.
+        file_format: Format pliku (`ndjson` lub `csv`).
+        db: Sesja bazy danych.
+        user_id: Identyfikator zalogowanego użytkownika.
+        
+    Returns:
+        Raport z liczbą zaimportowanych i odrzuconych rekordów.
+    """
+    imported = 0
+    failed = 0
+    errors: List[TaskImportError] = []
+    batch: List[TaskCreate] = []
+    
+    async for line, record in iter_records(
+        file_format, request.stream(), settings.IMPORT_MAX_LINE_BYTES
+    ):
+        try:
+            if isinstance(record, str):
+                raise ValueError(record)
+            batch.append(TaskCreate.parse_obj(record))
+        except (ValueError, ValidationError) as exc:
+            failed += 1
+            if len(errors) < settings.IMPORT_MAX_ERRORS:
+                detail = validation_detail(exc) if isinstance(exc, ValidationError) else str(exc)
+                errors.append(TaskImportError(line=line, detail=detail))
+            continue
+        
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            imported += await run_db(db, crud_task.import_tasks, user_id, batch)
+            batch = []
+    
+    if batch:
+        imported += await run_db(db, crud_task.import_tasks, user_id, batch)
+    
+    return TaskImportResult(imported=imported, failed=failed, errors=errors)
+
+
+@router.get("/stats", response_model=TaskStatsSummary)
+async def read_task_stats(
+    db: DbSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id),
+) -> Any:
+    """
+    Pobiera statystyki zadań zalogowanego użytkownika.
+    
+    Liczby wszystkich i ukończonych zadań pochodzą z liczników aktualizowanych
+    w transakcjach zapisu zadań, a liczba zaległych z zakresu indeksu, więc
+    koszt zapytania nie zależy od liczby zadań.
+    
+    Args:
+        db: Sesja bazy danych tylko do odczytu.
+        user_id: Identyfikator zalogowanego użytkownika.
+        
+    Returns:
+        Liczby wszystkich, ukończonych, oczekujących i zaległych zadań.
+    """
+    return await run_db(db, crud_task.get_task_stats, user_id)
+
+
+@router.get("/search", response_model=List[TaskSearchResult])
+async def search_tasks(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: DbSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id),
+) -> Any:
+    """
+    Wyszukuje zadania zalogowanego użytkownika po słowach z tytułu i opisu.
+    
+    Wyszukiwanie korzysta z indeksu pełnotekstowego SQLite FTS5: zadanie musi
+    zawierać wszystkie słowa zapytania (ostatnie także jako prefiks), wielkość
+    liter i znaki diakrytyczne są pomijane, a wyniki uszeregowane są według
+    trafności. Tytuł i fragment opisu są fragmentami HTML: tekst zadania jest
+    zakodowany, a trafienia oznaczone `<mark>`.
+    Koszt zapytania zależy od liczby trafień, a nie od liczby zadań.
+    
+    Args:
+        request: Żądanie HTTP (parametry zapytania i nagłówek If-None-Match).
+        response: Odpowiedź HTTP, do której dodawany jest nagłówek ETag.
+        q: Tekst zapytania.
+        skip: Liczba wyników do pominięcia.
+        limit: Maksymalna liczba wyników.
+        db: Sesja bazy danych tylko do odczytu.
+        user_id: Identyfikator zalogowanego użytkownika.
+        
+    Returns:
+        Lista zadań od najbardziej trafnych.
+    """
+    version = await run_db(db, crud_task.get_tasks_version, user_id)
+    etag = make_etag(user_id, version, request.url.query)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    
+    return await run_db(db, crud_task.search_tasks, user_id, q, skip, limit)
+
+
 @router.get("/{task_id}", response_model=TaskSchema)
-def read_task(
+async def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id),
 ) -> Any:
     """
     Pobiera zadanie o podanym identyfikatorze.
     
+    Znacznik ETag wyznaczany jest z wersji listy zadań użytkownika, więc żądanie
+    z aktualnym If-None-Match otrzymuje 304 bez odczytu zadania.
+    
     Args:
         task_id: Identyfikator zadania.
-        db: Sesja bazy danych.
-        current_user: Aktualnie zalogowany użytkownik.
+        request: Żądanie HTTP z opcjonalnym nagłówkiem If-None-Match.
+        response: Odpowiedź HTTP, do której dodawany jest nagłówek ETag.
+        db: Sesja bazy danych tylko do odczytu.
+        user_id: Identyfikator zalogowanego użytkownika.
         
     Returns:
         Zadanie.
@@ -94,31 +573,27 @@ def read_task(
     Raises:
         HTTPException: Jeśli zadanie nie istnieje lub nie należy do zalogowanego użytkownika.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    version = await run_db(db, crud_task.get_tasks_version, user_id)
+    cached = not_modified(request, response, make_etag(user_id, version, task_id))
+    if cached is not None:
+        return cached
     
-    # Sprawdzenie, czy zadanie istnieje
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Zadanie nie istnieje."
-        )
-        
-    # Sprawdzenie, czy zadanie należy do zalogowanego użytkownika
-    if task.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Brak dostępu do tego zadania."
-        )
-        
+    fetch = crud_task.get_task_row if settings.FAST_JSON_RESPONSES else crud_task.get_task
+    task = await run_db(db, fetch, task_id, user_id)
+    if task is None:
+        raise await task_access_error(db, task_id)
+    
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(task._asdict(), headers=dict(response.headers))
     return task
 
 
 @router.put("/{task_id}", response_model=TaskSchema)
-def update_task(
+async def update_task(
     task_id: int,
     task_in: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id),
 ) -> Any:
     """
     Aktualizuje zadanie o podanym identyfikatorze.
@@ -127,7 +602,7 @@ def update_task(
         task_id: Identyfikator zadania.
         task_in: Dane do aktualizacji.
         db: Sesja bazy danych.
-        current_user: Aktualnie zalogowany użytkownik.
+        user_id: Identyfikator zalogowanego użytkownika.
         
     Returns:
         Zaktualizowane zadanie.
@@ -135,70 +610,33 @@ def update_task(
     Raises:
         HTTPException: Jeśli zadanie nie istnieje lub nie należy do zalogowanego użytkownika.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    
-    # Sprawdzenie, czy zadanie istnieje
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Zadanie nie istnieje."
-        )
-        
-    # Sprawdzenie, czy zadanie należy do zalogowanego użytkownika
-    if task.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Brak dostępu do tego zadania."
-        )
-    
-    # Aktualizacja zadania
-    update_data = task_in.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
-        
-    # Zapisanie zmian w bazie danych
-    db.add(task)
-    db.commit()
-    db.refresh(task)
+    # Aktualizacja zadania ograniczona do właściciela i zapisanie zmian w bazie danych
+    task = await run_write(db, crud_task.update_task, task_id, user_id, task_in)
+    if task is None:
+        raise await task_access_error(db, task_id)
     
     return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> Any:
+    db: DbSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id),
+) -> None:
     """
     Usuwa zadanie o podanym identyfikatorze.
     
     Args:
         task_id: Identyfikator zadania.
         db: Sesja bazy danych.
-        current_user: Aktualnie zalogowany użytkownik.
+        user_id: Identyfikator zalogowanego użytkownika.
         
     Raises:
         HTTPException: Jeśli zadanie nie istnieje lub nie należy do zalogowanego użytkownika.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    
-    # Sprawdzenie, czy zadanie istnieje
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Zadanie nie istnieje."
-        )
-        
-    # Sprawdzenie, czy zadanie należy do zalogowanego użytkownika
-    if task.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Brak dostępu do tego zadania."
-        )
-        
-    # Usunięcie zadania z bazy danych
-    db.delete(task)
-    db.commit()
+    # Usunięcie zadania ograniczone do właściciela
+    if not await run_write(db, crud_task.delete_task, task_id, user_id):
+        raise await task_access_error(db, task_id)
     
-    return None 
\ No newline at end of file
+    return None
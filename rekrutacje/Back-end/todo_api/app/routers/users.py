@@ -1,12 +1,13 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from app.core.database import get_db
-from app.core.security import get_password_hash
+from app.core.cache import UserSnapshot
+from app.core.database import DbSession, get_session, run_db
+from app.core.security import get_password_hash_async
+from app.crud import user as crud_user
 from app.models.user import User
-from app.routers.auth import get_current_user
+from app.routers.auth import check_rate_limit, get_current_user
 from app.schemas.user import User as UserSchema
 from app.schemas.user import UserCreate
 
@@ -14,13 +15,17 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.post("", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def create_user(
-    user_in: UserCreate, db: Session = Depends(get_db)
+async def create_user(
+    request: Request, user_in: UserCreate, db: DbSession = Depends(get_session)
 ) -> Any:
     """
     Tworzy nowego użytkownika.
     
+    Zapytania do bazy wykonywane są przez `run_db`, a hashowanie hasła
+    w ograniczonej puli wykonawców, więc pętla zdarzeń nie jest blokowana.
+    
     Args:
+        request: Żądanie HTTP (adres klienta dla ogranicznika żądań).
         user_in: Dane nowego użytkownika.
         db: Sesja bazy danych.
         
@@ -28,19 +33,20 @@ def create_user(
         Utworzony użytkownik.
         
     Raises:
-        HTTPException: Jeśli użytkownik o podanym emailu lub nazwie użytkownika już istnieje.
+        HTTPException: Jeśli użytkownik o podanym emailu lub nazwie użytkownika już istnieje
+            albo przekroczono limit żądań.
     """
+    await check_rate_limit(request, user_in.username)
+    
     # Sprawdzenie, czy użytkownik o podanym emailu już istnieje
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if user:
+    if await run_db(db, crud_user.get_user_by_email, user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Użytkownik o podanym adresie email już istnieje."
         )
         
     # Sprawdzenie, czy użytkownik o podanej nazwie użytkownika już istnieje
-    user = db.query(User).filter(User.username == user_in.username).first()
-    if user:
+    if await run_db(db, crud_user.get_user_by_username, user_in.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Użytkownik o podanej nazwie użytkownika już istnieje."
@@ -50,21 +56,17 @@ def create_user(
     user = User(
         email=user_in.email,
         username=user_in.username,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         is_active=user_in.is_active
     )
     
     # Zapisanie użytkownika w bazie danych
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    
-    return user
+    return await run_db(db, crud_user.create_user, user)
 
 
 @router.get("/me", response_model=UserSchema)
 def read_users_me(
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ) -> Any:
     """
     Pobiera dane aktualnie zalogowanego użytkownika.
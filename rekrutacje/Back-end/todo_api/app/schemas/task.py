@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -32,4 +33,78 @@ class Task(TaskBase):
     owner_id: int
     
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+
+# Schemat dla wyniku wyszukiwania pełnotekstowego (fragmenty HTML: zakodowany tekst
+# zadania z trafieniami wyróżnionymi znacznikami <mark>)
+class TaskSearchResult(Task):
+    rank: Optional[float] = None
+    title_highlight: Optional[str] = None
+    description_snippet: Optional[str] = None
+
+
+# Formaty plików eksportu i importu zadań
+class TaskFileFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+# Dostępne porządki sortowania listy zadań (każdy oparty na indeksie)
+class TaskSort(str, Enum):
+    created_at = "created_at"
+    created_at_desc = "-created_at"
+    due_date = "due_date"
+    due_date_desc = "-due_date"
+
+
+# Schemat dla filtrów listy zadań (parametry zapytania)
+class TaskFilter(BaseModel):
+    completed: Optional[bool] = None
+    due_before: Optional[datetime] = None
+    due_after: Optional[datetime] = None
+    overdue: bool = False
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
+# Schemat dla statystyk zadań użytkownika
+class TaskStatsSummary(BaseModel):
+    total: int
+    completed: int
+    pending: int
+    overdue: int
+
+
+# Schemat dla pozycji zbiorczej aktualizacji zadań
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+# Schemat dla wyniku operacji zbiorczej na pojedynczym zadaniu
+class TaskBulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: int
+    detail: Optional[str] = None
+    task: Optional[Task] = None
+
+
+# Schemat dla raportu operacji zbiorczej
+class TaskBulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
+
+# Schemat dla błędu pojedynczej linii importu
+class TaskImportError(BaseModel):
+    line: int
+    detail: str
+
+
+# Schemat dla raportu importu zadań
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskImportError]
@@ -0,0 +1,81 @@
+"""
+Zysk z kompresji odpowiedzi a koszt CPU dla typowych stron listy zadań.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_compression --page-size 100 --description 0 200 2000
+
+Dla każdej długości opisu zadania skrypt buduje stronę JSON taką jak
+`GET /tasks` i kompresuje ją każdym dostępnym koderem (gzip zawsze,
+brotli i zstd, jeśli są zainstalowane) z poziomami z `Settings`.
+"""
+import argparse
+import random
+import string
+import time
+from datetime import datetime, timedelta
+
+from app.core.compression import available_encoders
+from app.core.config import settings
+from app.core.responses import dumps
+
+
+def build_page(page_size: int, description_length: int) -> bytes:
+    """Tworzy stronę listy zadań o podanej długości opisów."""
+    rng = random.Random(description_length)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(300)]
+    created = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(page_size):
+        description = ""
+        while len(description) < description_length:
+            description += rng.choice(words) + " "
+        tasks.append({
+            "title": f"Zadanie {i}",
+            "description": description[:description_length] or None,
+            "is_completed": i % 3 == 0,
+            "due_date": created + timedelta(days=i) if i % 2 else None,
+            "id": i + 1,
+            "created_at": created + timedelta(minutes=i),
+            "owner_id": 1,
+        })
+    return dumps(tasks)
+
+
+def measure(factory, body: bytes, repeat: int) -> tuple:
+    """Zwraca rozmiar po kompresji i średni czas CPU (w ms) kompresji strony."""
+    start = time.process_time()
+    for _ in range(repeat):
+        encoder = factory()
+        data = encoder.compress(body) + encoder.finish()
+    return len(data), (time.process_time() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100, help="liczba zadań na stronie")
+    parser.add_argument(
+        "--description", type=int, nargs="+", default=[0, 200, 2000], help="długości opisów zadań"
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="liczba powtórzeń pomiaru")
+    args = parser.parse_args()
+
+    encoders = available_encoders(
+        settings.COMPRESSION_GZIP_LEVEL,
+        settings.COMPRESSION_BROTLI_QUALITY,
+        settings.COMPRESSION_ZSTD_LEVEL,
+    )
+    for description_length in args.description:
+        body = build_page(args.page_size, description_length)
+        print(f"\nOpis {description_length} znaków, strona {args.page_size} zadań: {len(body)} B")
+        for name, factory in encoders.items():
+            size, cpu_ms = measure(factory, body, args.repeat)
+            saved = len(body) - size
+            print(
+                f"  {name:<5} {size:>8} B  oszczędność {saved:>8} B ({saved / len(body):6.1%})"
+                f"  CPU {cpu_ms:7.3f} ms  ({saved / 1024 / max(cpu_ms, 1e-6):8.1f} KiB/ms CPU)"
+            )
+
+
+if __name__ == "__main__":
+    main()
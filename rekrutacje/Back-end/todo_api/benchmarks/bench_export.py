@@ -0,0 +1,92 @@
+"""
+Porównanie szczytowego zużycia pamięci przy eksporcie wszystkich zadań:
+stronicowanie `get_tasks` z modelami Pydantic (jak przy wielokrotnym
+wywołaniu `read_tasks`) oraz strumieniowy eksport porcjami z kursora.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_export --tasks 5000 20000
+
+Ścieżka stronicowana zbiera wszystkie strony, tak jak klient składający
+pełny eksport; ścieżka strumieniowa odrzuca każdą porcję po zakodowaniu.
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.export import encode_header, encode_rows
+from app.core.responses import dumps
+from app.crud import task as crud_task
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import Task as TaskSchema
+from app.schemas.task import TaskFileFormat
+
+PAGE_SIZE = 100
+
+
+def paged_export(db) -> int:
+    """Składa eksport ze stron `get_tasks` po 100 zadań, przechowując wszystkie modele."""
+    tasks = []
+    skip = 0
+    while True:
+        page = crud_task.get_tasks(db, 1, skip=skip, limit=PAGE_SIZE)
+        tasks.extend(TaskSchema.from_orm(task) for task in page)
+        if len(page) < PAGE_SIZE:
+            break
+        skip += PAGE_SIZE
+    return len(dumps(jsonable_encoder(tasks)))
+
+
+def streamed_export(db) -> int:
+    """Koduje eksport NDJSON porcjami `iter_task_rows`, tak jak `GET /tasks/export`."""
+    size = len(encode_header(TaskFileFormat.ndjson, list(TaskSchema.__fields__)))
+    for rows in crud_task.iter_task_rows(db, 1):
+        size += len(encode_rows(TaskFileFormat.ndjson, rows))
+    return size
+
+
+def measure(session_factory, export: Callable) -> tuple:
+    """Zwraca szczytowe zużycie pamięci (MiB), czas (s) i rozmiar eksportu (bajty)."""
+    with session_factory() as db:
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = export(db)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[5000, 20000], help="liczby zadań użytkownika")
+    args = parser.parse_args()
+
+    for count in args.tasks:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        with session_factory() as db:
+            db.add(User(id=1, email="bench@example.com", username="bench", hashed_password="x"))
+            db.add_all(
+                Task(title=f"Zadanie {i}", description="Opis zadania " * 5, owner_id=1)
+                for i in range(count)
+            )
+            db.commit()
+
+        print(f"\nZadań: {count}")
+        for label, export in (("stronicowany", paged_export), ("strumieniowy", streamed_export)):
+            peak, elapsed, size = measure(session_factory, export)
+            print(f"  {label:<13} szczyt pamięci: {peak:7.1f} MiB, czas: {elapsed:.2f} s, rozmiar: {size} B")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
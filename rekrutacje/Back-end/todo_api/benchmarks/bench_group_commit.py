@@ -0,0 +1,109 @@
+"""
+Przepustowość pojedynczych zapisów zadań z zatwierdzaniem każdego żądania osobno
+i przez koordynator zapisów grupowych.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_group_commit --clients 1 16 64 --synchronous NORMAL FULL
+
+Każdy klient w pętli tworzy zadanie (`crud_task.create_task`) i czeka na
+wynik, tak jak kolejne żądania POST /tasks. Bez koordynatora każdy zapis
+wykonuje własną sesją i własnym commitem w puli wątków, z koordynatorem
+zapisy z okna `--window-ms` trafiają do jednej transakcji. Przy
+`synchronous=FULL` każdy commit wykonuje fsync, więc różnica jest największa.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, create_db_engine, run_db
+from app.core.group_commit import WriteCoordinator
+from app.crud import task as crud_task
+from app.models import task_stats, task_version  # noqa: F401  (rejestracja modeli w metadanych)
+from app.models.user import User
+from app.schemas.task import TaskCreate
+from benchmarks.utils import format_summary, summarize
+
+USERS = 10
+
+
+async def client(write, owner_id: int, deadline: float, latencies: List[float]) -> None:
+    """Tworzy kolejne zadania aż do upływu czasu pomiaru."""
+    task_in = TaskCreate(title="Nowe zadanie", description="Opis zadania")
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await write(crud_task.create_task, owner_id, task_in)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(session_factory, clients: int, grouped: bool, args) -> List[float]:
+    """Przeprowadza pomiar dla jednej liczby klientów i zwraca czasy zapisów."""
+    coordinator = WriteCoordinator(
+        session_factory, window_seconds=args.window_ms / 1000, max_batch=args.max_batch
+    )
+
+    async def write(fn, *fn_args):
+        if grouped:
+            return await coordinator.submit(fn, *fn_args)
+        with session_factory() as db:
+            return await run_db(db, fn, *fn_args)
+
+    latencies: List[float] = []
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*[
+        client(write, i % USERS + 1, deadline, latencies) for i in range(clients)
+    ])
+    return latencies
+
+
+def build_session_factory(path: str, synchronous: str):
+    """Tworzy bazę z profilem z ustawień i podanym trybem `synchronous`."""
+    engine = create_db_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _synchronous(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"PRAGMA synchronous={synchronous}")
+
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    with session_factory() as db:
+        db.add_all(
+            User(id=i, email=f"user{i}@example.com", username=f"user{i}", hashed_password="x")
+            for i in range(1, USERS + 1)
+        )
+        db.commit()
+    return engine, session_factory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64], help="liczby współbieżnych klientów")
+    parser.add_argument("--synchronous", nargs="+", default=["NORMAL", "FULL"], help="tryby PRAGMA synchronous")
+    parser.add_argument("--duration", type=float, default=3.0, help="czas pomiaru w sekundach")
+    parser.add_argument("--window-ms", type=float, default=settings.GROUP_COMMIT_WINDOW_MS, help="okno zbierania zapisów")
+    parser.add_argument("--max-batch", type=int, default=settings.GROUP_COMMIT_MAX_BATCH, help="maksymalna wielkość grupy")
+    args = parser.parse_args()
+
+    for synchronous in args.synchronous:
+        for clients in args.clients:
+            print(f"\nsynchronous={synchronous}, klienci: {clients}")
+            for grouped in (False, True):
+                directory = tempfile.mkdtemp(prefix="todo_bench_")
+                engine, session_factory = build_session_factory(
+                    os.path.join(directory, "bench.db"), synchronous
+                )
+                latencies = asyncio.run(run(session_factory, clients, grouped, args))
+                engine.dispose()
+                label = "grupowo" if grouped else "osobne commity"
+                print(f"  {len(latencies) / args.duration:8.1f} zapisów/s  " + format_summary(label, summarize(latencies)))
+
+
+if __name__ == "__main__":
+    main()
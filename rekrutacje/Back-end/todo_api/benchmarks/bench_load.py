@@ -0,0 +1,435 @@
+"""
+Test obciążeniowy trzech aplikacji Todo: main:app, simple_app:app i flask_app:app.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_load --backends main simple flask --users 16 --duration 10 \\
+        --output wyniki.json --compare poprzednie.json
+
+Wirtualni użytkownicy rejestrują się (i logują, jeśli aplikacja to
+udostępnia; nieudana rejestracja kończy użytkownika), a następnie w pętli
+wykonują losowe operacje z mieszanki `--mix` (logowanie, utworzenie, lista,
+aktualizacja i usunięcie własnego zadania). Operacje, których aplikacja nie udostępnia
+(np. logowanie w simple_app), są pomijane. Domyślnie żądania trafiają do
+aplikacji w procesie: aplikacje ASGI przez `httpx.ASGITransport`, Flask
+przez `httpx.WSGITransport` w puli wątków. Z `--transport socket` aplikacje
+działają na serwerze (uvicorn lub werkzeug) w wątku w tle, a żądania idą
+przez gniazda TCP.
+
+Każda aplikacja korzysta z plików bazy w katalogu tymczasowym. Wynik zawiera
+przepustowość oraz p50/p95/p99 dla każdej operacji; `--output` zapisuje go
+jako JSON (z identyfikatorem commita), a `--compare` pokazuje zmianę
+względem wcześniej zapisanego pliku.
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import logging
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from benchmarks.utils import format_summary, free_port, serve_in_thread, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "bench_password"
+OPERATIONS = ("login", "create", "list", "update", "delete")
+DEFAULT_MIX = "login=2,create=20,list=50,update=18,delete=10"
+
+
+class Backend:
+    """
+    Operacje scenariusza dla jednej aplikacji.
+
+    Metody operacji wykonują jedno żądanie i zwracają odpowiedź; `state`
+    to słownik wirtualnego użytkownika (identyfikator, token, jego zadania).
+    """
+
+    module = ""
+    supported: tuple = ()
+
+    def load(self):
+        """Importuje moduł aplikacji (w katalogu z tymczasową bazą) i zwraca aplikację."""
+        return importlib.import_module(self.module).app
+
+    def is_asgi(self) -> bool:
+        return True
+
+    async def register(self, client, state: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class MainBackend(Backend):
+    """Główne API (FastAPI, SQLAlchemy, JWT)."""
+
+    module = "main"
+    supported = OPERATIONS
+
+    def load(self):
+        from benchmarks.utils import use_temporary_database
+        use_temporary_database()
+        settings.RATE_LIMIT_ENABLED = False  # wszyscy wirtualni użytkownicy mają ten sam adres IP
+        return super().load()
+
+    def _headers(self, state):
+        return {"Authorization": f"Bearer {state['token']}"}
+
+    async def register(self, client, state):
+        name = state["name"]
+        response = await client.request("POST", "/api/v1/users", json={
+            "email": f"{name}@example.com", "username": name, "password": PASSWORD,
+        })
+        response.raise_for_status()
+        (await self.login(client, state)).raise_for_status()
+
+    async def login(self, client, state):
+        response = await client.request(
+            "POST", "/api/v1/token", data={"username": state["name"], "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            state["token"] = response.json()["access_token"]
+        return response
+
+    async def create(self, client, state):
+        return await client.request(
+            "POST", "/api/v1/tasks", json={"title": "Zadanie", "description": "Opis zadania"},
+            headers=self._headers(state),
+        )
+
+    async def list(self, client, state):
+        return await client.request("GET", "/api/v1/tasks", headers=self._headers(state))
+
+    async def update(self, client, state, task_id):
+        return await client.request(
+            "PUT", f"/api/v1/tasks/{task_id}", json={"is_completed": True},
+            headers=self._headers(state),
+        )
+
+    async def delete(self, client, state, task_id):
+        return await client.request(
+            "DELETE", f"/api/v1/tasks/{task_id}", headers=self._headers(state)
+        )
+
+
+class SimpleBackend(Backend):
+    """Prosta aplikacja FastAPI na sqlite3 (bez logowania, aktualizacji i usuwania)."""
+
+    module = "simple_app"
+    supported = ("create", "list")
+
+    async def register(self, client, state):
+        name = state["name"]
+        response = await client.request("POST", "/users/", json={
+            "username": name, "email": f"{name}@example.com", "password": PASSWORD,
+        })
+        response.raise_for_status()
+        state["user_id"] = response.json()["id"]
+
+    async def create(self, client, state):
+        return await client.request(
+            "POST", "/todos/", params={"user_id": state["user_id"]},
+            json={"title": "Zadanie", "description": "Opis zadania"},
+        )
+
+    async def list(self, client, state):
+        return await client.request("GET", "/todos/", params={"user_id": state["user_id"]})
+
+
+class FlaskBackend(Backend):
+    """Aplikacja Flask z danymi w pliku JSON (bez logowania)."""
+
+    module = "flask_app"
+    supported = ("create", "list", "update", "delete")
+
+    def is_asgi(self) -> bool:
+        return False
+
+    async def register(self, client, state):
+        response = await client.request("POST", "/users", json={"username": state["name"]})
+        response.raise_for_status()
+        state["user_id"] = response.json()["id"]
+
+    async def create(self, client, state):
+        return await client.request(
+            "POST", f"/users/{state['user_id']}/tasks",
+            json={"title": "Zadanie", "description": "Opis zadania"},
+        )
+
+    async def list(self, client, state):
+        return await client.request("GET", f"/users/{state['user_id']}/tasks")
+
+    async def update(self, client, state, task_id):
+        return await client.request("PUT", f"/tasks/{task_id}", json={"completed": True})
+
+    async def delete(self, client, state, task_id):
+        return await client.request("DELETE", f"/tasks/{task_id}")
+
+
+BACKENDS = {"main": MainBackend, "simple": SimpleBackend, "flask": FlaskBackend}
+
+
+class ThreadedClient:
+    """Klient synchroniczny (transport WSGI) wywoływany z pętli zdarzeń w puli wątków."""
+
+    def __init__(self, client: httpx.Client, workers: int):
+        self._client = client
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: self._client.request(method, url, **kwargs)
+        )
+
+    async def aclose(self) -> None:
+        self._executor.shutdown()
+        self._client.close()
+
+
+@contextlib.contextmanager
+def serve_wsgi_in_thread(app, port: int) -> Iterator[str]:
+    """Uruchamia aplikację WSGI na wielowątkowym serwerze werkzeug w wątku w tle."""
+    from werkzeug.serving import make_server
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Zamienia napis `operacja=waga,...` na słownik wag."""
+    mix = {}
+    for item in value.split(","):
+        name, weight = item.split("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Nieznana operacja: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+async def virtual_user(
+    backend: Backend, client, index: int, mix: Dict[str, float], deadline: float,
+    records: Dict[str, List], seed: int,
+) -> None:
+    """Rejestruje użytkownika i wykonuje losowe operacje aż do upływu czasu pomiaru."""
+    rng = random.Random(seed + index)
+    state: Dict[str, Any] = {"name": f"load_user_{index}", "tasks": []}
+    start = time.perf_counter()
+    try:
+        await backend.register(client, state)
+    except Exception as exc:
+        records["register"].append((time.perf_counter() - start, type(exc).__name__))
+        return
+    records["register"].append((time.perf_counter() - start, 201))
+    operations = [name for name in mix if name in backend.supported]
+    weights = [mix[name] for name in operations]
+    while time.perf_counter() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        # Aktualizacja i usunięcie dotyczą własnych zadań; bez nich najpierw utworzenie
+        if operation in ("update", "delete") and not state["tasks"]:
+            operation = "create"
+        args = ()
+        if operation in ("update", "delete"):
+            task_id = rng.choice(state["tasks"])
+            if operation == "delete":
+                state["tasks"].remove(task_id)
+            args = (task_id,)
+        start = time.perf_counter()
+        try:
+            response = await getattr(backend, operation)(client, state, *args)
+            status = response.status_code
+        except Exception as exc:
+            response, status = None, type(exc).__name__
+        records[operation].append((time.perf_counter() - start, status))
+        if operation == "create" and response is not None and response.status_code == 201:
+            state["tasks"].append(response.json()["id"])
+
+
+async def drive(backend: Backend, client, args) -> Dict[str, List]:
+    """Uruchamia wirtualnych użytkowników i zwraca pomiary według operacji."""
+    records: Dict[str, List] = {name: [] for name in ("register",) + OPERATIONS}
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*[
+        virtual_user(backend, client, index, args.mix, deadline, records, args.seed)
+        for index in range(args.users)
+    ])
+    return records
+
+
+async def run_in_process(backend: Backend, app, args) -> Dict[str, List]:
+    """Pomiar przez transport ASGI lub WSGI, z obsługą zdarzeń startu i zamknięcia."""
+    if not backend.is_asgi():
+        client = ThreadedClient(
+            httpx.Client(transport=httpx.WSGITransport(app=app), base_url="http://test"),
+            workers=args.users,
+        )
+        try:
+            return await drive(backend, client, args)
+        finally:
+            await client.aclose()
+
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            return await drive(backend, client, args)
+    finally:
+        await app.router.shutdown()
+
+
+async def run_over_socket(backend: Backend, app, args) -> Dict[str, List]:
+    """Pomiar przez gniazda TCP (uvicorn lub werkzeug w wątku w tle)."""
+    serve = serve_in_thread if backend.is_asgi() else serve_wsgi_in_thread
+    with serve(app, free_port()) as base_url:
+        limits = httpx.Limits(max_connections=args.users)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            return await drive(backend, client, args)
+
+
+def report(records: Dict[str, List], duration: float) -> Dict[str, Any]:
+    """Podsumowuje pomiary: przepustowość, percentyle i statusy dla każdej operacji."""
+    result: Dict[str, Any] = {"operations": {}}
+    everything: List[float] = []
+    errors = 0
+    for operation, samples in records.items():
+        if not samples:
+            continue
+        latencies = [latency for latency, _ in samples]
+        statuses = Counter(str(status) for _, status in samples)
+        failed = sum(
+            count for status, count in statuses.items()
+            if not status.isdigit() or int(status) >= 400
+        )
+        everything.extend(latencies)
+        errors += failed
+        result["operations"][operation] = {
+            **summarize(latencies),
+            "throughput_rps": len(latencies) / duration,
+            "errors": failed,
+            "statuses": dict(statuses),
+        }
+    result["overall"] = {
+        **summarize(everything),
+        "throughput_rps": len(everything) / duration,
+        "errors": errors,
+    }
+    return result
+
+
+def print_report(name: str, result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """Wypisuje wynik aplikacji, opcjonalnie ze zmianą względem pomiaru odniesienia."""
+    print(f"\nAplikacja: {name}")
+    rows = list(result["operations"].items()) + [("razem", result["overall"])]
+    for operation, summary in rows:
+        line = (
+            f"  {summary['throughput_rps']:8.1f} żądań/s  błędy {summary['errors']:<5} "
+            + format_summary(operation, summary)
+        )
+        if baseline is not None:
+            previous = (
+                baseline["overall"] if operation == "razem"
+                else baseline["operations"].get(operation)
+            )
+            if previous and previous["throughput_rps"] and previous["p95_ms"]:
+                line += (
+                    f"  [przepustowość {summary['throughput_rps'] / previous['throughput_rps'] - 1:+.1%},"
+                    f" p95 {summary['p95_ms'] / previous['p95_ms'] - 1:+.1%}]"
+                )
+        print(line)
+
+
+def current_commit() -> Optional[str]:
+    """Zwraca identyfikator bieżącego commita (None poza repozytorium git)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS),
+        help="aplikacje do zmierzenia",
+    )
+    parser.add_argument(
+        "--transport", choices=["inprocess", "socket"], default="inprocess",
+        help="transport w procesie (ASGI/WSGI) lub przez gniazda TCP",
+    )
+    parser.add_argument("--users", type=int, default=16, help="liczba wirtualnych użytkowników")
+    parser.add_argument("--duration", type=float, default=10.0, help="czas pomiaru w sekundach")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+        help=f"wagi operacji (domyślnie {DEFAULT_MIX})",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="ziarno losowania operacji")
+    parser.add_argument(
+        "--bcrypt-rounds", type=int, default=None,
+        help="koszt bcrypt w main:app (domyślnie z ustawień)",
+    )
+    parser.add_argument("--output", help="plik JSON, do którego zapisywany jest wynik")
+    parser.add_argument("--compare", help="plik JSON z wcześniejszym wynikiem do porównania")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    output = os.path.abspath(args.output) if args.output else None
+
+    if args.bcrypt_rounds is not None:
+        settings.PASSWORD_BCRYPT_ROUNDS = args.bcrypt_rounds
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Aplikacje tworzą pliki bazy względem katalogu roboczego
+    os.chdir(tempfile.mkdtemp(prefix="todo_bench_"))
+
+    results: Dict[str, Any] = {}
+    for name in args.backends:
+        backend = BACKENDS[name]()
+        try:
+            app = backend.load()
+        except ImportError as exc:
+            print(f"\nAplikacja: {name} - pominięto ({exc})")
+            continue
+        runner = run_in_process if args.transport == "inprocess" else run_over_socket
+        records = asyncio.run(runner(backend, app, args))
+        results[name] = report(records, args.duration)
+        previous = baseline["results"].get(name) if baseline else None
+        print_report(name, results[name], previous)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": current_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "transport": args.transport,
+                "users": args.users,
+                "duration": args.duration,
+                "mix": args.mix,
+                "results": results,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\nZapisano wynik: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Pomiar opóźnień GET /tasks podczas serii równoległych logowań.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_login_latency --logins 8 --readers 4 --duration 5
+
+Skrypt uruchamia API w wątku na tymczasowej bazie, a następnie mierzy
+opóźnienia listy zadań najpierw bez obciążenia, a potem w trakcie
+równoległych logowań (bcrypt).
+"""
+import argparse
+import threading
+import time
+from typing import List
+
+import requests
+
+from app.core.config import settings
+from benchmarks.utils import (
+    format_summary,
+    free_port,
+    serve_in_thread,
+    summarize,
+    use_temporary_database,
+)
+
+USERNAME = "bench_user"
+PASSWORD = "bench_password"
+
+
+def read_tasks_loop(base_url: str, token: str, stop: threading.Event, out: List[float]) -> None:
+    """Wielokrotnie pobiera listę zadań i zapisuje czasy odpowiedzi."""
+    session = requests.Session()
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = session.get(f"{base_url}/api/v1/tasks", headers=headers)
+        out.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+def login_loop(base_url: str, stop: threading.Event, out: List[float]) -> None:
+    """Wielokrotnie loguje użytkownika i zapisuje czasy odpowiedzi."""
+    session = requests.Session()
+    form = {"username": USERNAME, "password": PASSWORD}
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = session.post(f"{base_url}/api/v1/token", data=form)
+        out.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+def run_phase(base_url: str, token: str, readers: int, logins: int, duration: float):
+    """Uruchamia jedną fazę pomiaru i zwraca czasy odczytów oraz logowań."""
+    stop = threading.Event()
+    read_latencies: List[float] = []
+    login_latencies: List[float] = []
+    threads = [
+        threading.Thread(target=read_tasks_loop, args=(base_url, token, stop, read_latencies))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(target=login_loop, args=(base_url, stop, login_latencies))
+        for _ in range(logins)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return read_latencies, login_latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=8, help="liczba wątków logujących")
+    parser.add_argument("--readers", type=int, default=4, help="liczba wątków czytających")
+    parser.add_argument("--duration", type=float, default=5.0, help="czas fazy w sekundach")
+    parser.add_argument("--tasks", type=int, default=50, help="liczba zadań użytkownika")
+    args = parser.parse_args()
+
+    use_temporary_database()
+    # Pomiar dotyczy kosztu bcrypt, więc ogranicznik logowań jest wyłączony
+    settings.RATE_LIMIT_ENABLED = False
+    from main import app
+
+    with serve_in_thread(app, free_port()) as base_url:
+        requests.post(
+            f"{base_url}/api/v1/users",
+            json={"email": "bench@example.com", "username": USERNAME, "password": PASSWORD},
+        ).raise_for_status()
+        token = requests.post(
+            f"{base_url}/api/v1/token",
+            data={"username": USERNAME, "password": PASSWORD},
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for i in range(args.tasks):
+            requests.post(
+                f"{base_url}/api/v1/tasks",
+                json={"title": f"Zadanie {i}", "description": "Opis zadania"},
+                headers=headers,
+            ).raise_for_status()
+
+        idle_reads, _ = run_phase(base_url, token, args.readers, 0, args.duration)
+        busy_reads, logins = run_phase(base_url, token, args.readers, args.logins, args.duration)
+
+    print(format_summary("GET /tasks (bez logowań)", summarize(idle_reads)))
+    print(format_summary(f"GET /tasks ({args.logins} logujących)", summarize(busy_reads)))
+    print(format_summary("POST /token", summarize(logins)))
+
+
+if __name__ == "__main__":
+    main()
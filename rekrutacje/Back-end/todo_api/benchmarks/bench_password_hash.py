@@ -0,0 +1,92 @@
+"""
+Czas hashowania i weryfikacji haseł dla różnych ustawień kosztu.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_password_hash --bcrypt-rounds 10 11 12 13 --argon2 65536:3:4
+
+Dla każdego ustawienia skrypt mierzy czas `hash` i `verify` kontekstu
+z `create_password_context` w jednym wątku. Weryfikacja dominuje
+w kosztach logowania, więc wynik podaje też, ile logowań na sekundę
+obsłuży jeden rdzeń CPU, oraz liczbę rdzeni potrzebną dla `--login-rate`.
+Ustawienia argon2 (pamięć KiB:iteracje:wątki) mierzone są tylko
+przy zainstalowanym pakiecie argon2-cffi.
+"""
+import argparse
+import math
+import time
+from typing import List, Tuple
+
+from passlib.hash import argon2
+
+from app.core.security import create_password_context
+from benchmarks.utils import summarize
+
+PASSWORD = "bench_password"
+
+
+def measure(context, repeat: int) -> Tuple[List[float], List[float]]:
+    """Zwraca czasy hashowania i weryfikacji hasła (w sekundach)."""
+    hash_times: List[float] = []
+    verify_times: List[float] = []
+    hashed = context.hash(PASSWORD)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        context.hash(PASSWORD)
+        hash_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        verify_times.append(time.perf_counter() - start)
+    return hash_times, verify_times
+
+
+def report(label: str, context, repeat: int, login_rate: float) -> None:
+    """Wypisuje wynik pomiaru jednego ustawienia."""
+    hash_times, verify_times = measure(context, repeat)
+    hash_ms = summarize(hash_times)["p50_ms"]
+    verify_ms = summarize(verify_times)["p50_ms"]
+    per_core = 1000 / verify_ms
+    print(
+        f"{label:<26} hash p50 {hash_ms:8.2f} ms  verify p50 {verify_ms:8.2f} ms  "
+        f"{per_core:8.1f} logowań/s na rdzeń  "
+        f"rdzenie dla {login_rate:g}/s: {math.ceil(login_rate / per_core)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12, 13],
+        help="liczby rund bcrypt (log2)",
+    )
+    parser.add_argument(
+        "--argon2", nargs="*", default=["65536:3:4", "19456:2:1"],
+        help="ustawienia argon2 w postaci pamięć_KiB:iteracje:wątki",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="liczba powtórzeń pomiaru")
+    parser.add_argument(
+        "--login-rate", type=float, default=50, help="docelowa liczba logowań na sekundę"
+    )
+    args = parser.parse_args()
+
+    for rounds in args.bcrypt_rounds:
+        context = create_password_context("bcrypt", bcrypt_rounds=rounds)
+        report(f"bcrypt rounds={rounds}", context, args.repeat, args.login_rate)
+
+    if args.argon2 and not argon2.has_backend():
+        print("argon2: pominięto (brak pakietu argon2-cffi)")
+        return
+    for spec in args.argon2:
+        memory, time_cost, parallelism = (int(value) for value in spec.split(":"))
+        context = create_password_context(
+            "argon2",
+            argon2_memory_kib=memory,
+            argon2_time_cost=time_cost,
+            argon2_parallelism=parallelism,
+        )
+        report(f"argon2 m={memory} t={time_cost} p={parallelism}", context, args.repeat, args.login_rate)
+
+
+if __name__ == "__main__":
+    main()
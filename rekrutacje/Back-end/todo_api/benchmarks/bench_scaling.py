@@ -0,0 +1,132 @@
+"""
+Skalowanie przepustowości API z liczbą procesów roboczych serve.py.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_scaling --workers 1 2 4 --clients-per-worker 4 --duration 10
+
+Dla każdej liczby procesów skrypt uruchamia `serve.py` na świeżej bazie
+w katalogu tymczasowym, a procesy klienckie (osobne, aby klient nie był
+wąskim gardłem) pobierają w pętli stronę listy zadań. Wynik pokazuje
+przepustowość i przyspieszenie względem jednego procesu; skalowanie
+zbliżone do liniowego wymaga co najmniej tylu rdzeni CPU, ilu procesów
+roboczych i klienckich łącznie.
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+import requests
+
+from benchmarks.utils import format_summary, free_port, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERNAME = "bench_user"
+PASSWORD = "bench_password"
+
+
+def start_server(workers: int, port: int, directory: str) -> subprocess.Popen:
+    """Uruchamia serve.py w katalogu z tymczasową bazą i czeka na gotowość."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "serve.py"), "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port)],
+        cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Serwer nie wystartował w ciągu 60 s.")
+
+
+def prepare(base_url: str, tasks: int) -> str:
+    """Tworzy użytkownika i jego zadania; zwraca token dostępu."""
+    requests.post(
+        f"{base_url}/api/v1/users",
+        json={"email": "bench@example.com", "username": USERNAME, "password": PASSWORD},
+    ).raise_for_status()
+    token = requests.post(
+        f"{base_url}/api/v1/token", data={"username": USERNAME, "password": PASSWORD},
+    ).json()["access_token"]
+    requests.post(
+        f"{base_url}/api/v1/tasks/bulk",
+        json=[{"title": f"Zadanie {i}", "description": "Opis zadania " * 10} for i in range(tasks)],
+        headers={"Authorization": f"Bearer {token}"},
+    ).raise_for_status()
+    return token
+
+
+def client(args: Tuple[str, str, float, int]) -> List[float]:
+    """Proces kliencki: pobiera listę zadań do upływu czasu i zwraca czasy odpowiedzi."""
+    base_url, token, duration, page_size = args
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = session.get(f"{base_url}/api/v1/tasks", params={"limit": page_size})
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return latencies
+
+
+def run(workers: int, args) -> List[float]:
+    """Mierzy jedną konfigurację i zwraca czasy odpowiedzi wszystkich klientów."""
+    directory = tempfile.mkdtemp(prefix="todo_bench_")
+    port = free_port()
+    server = start_server(workers, port, directory)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        token = prepare(base_url, args.page_size)
+        clients = workers * args.clients_per_worker
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.map(
+                client, [(base_url, token, args.duration, args.page_size)] * clients
+            )
+        return [latency for latencies in results for latency in latencies]
+    finally:
+        # SIGTERM: łagodne zamknięcie wszystkich procesów roboczych
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4], help="liczby procesów roboczych"
+    )
+    parser.add_argument(
+        "--clients-per-worker", type=int, default=4, help="procesy klienckie na proces roboczy"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="czas pomiaru w sekundach")
+    parser.add_argument("--page-size", type=int, default=50, help="liczba zadań na stronie")
+    args = parser.parse_args()
+
+    print(f"Rdzenie CPU: {os.cpu_count()}")
+    # Przyspieszenie liczone względem pierwszej konfiguracji (domyślnie 1 proces)
+    baseline = None
+    for workers in args.workers:
+        latencies = run(workers, args)
+        throughput = len(latencies) / args.duration
+        baseline = baseline or throughput / workers
+        speedup = throughput / baseline
+        print(
+            f"\nProcesy robocze: {workers}  przepustowość: {throughput:.1f} req/s  "
+            f"przyspieszenie: {speedup:.2f}x  (efektywność {speedup / workers:.0%})"
+        )
+        print("  " + format_summary("GET /tasks", summarize(latencies)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Czas wyszukiwania zadań (FTS5 i LIKE) w zależności od liczby zadań użytkownika.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_search --tasks 1000 10000 100000 --users 5
+
+Dla każdej liczby zadań skrypt tworzy bazę w pamięci z indeksem FTS5,
+w której kilku użytkowników ma po tyle samo zadań o losowych tytułach
+i opisach, a następnie wykonuje `search_tasks` dla losowych słów:
+raz z indeksem pełnotekstowym, raz ze ścieżką zastępczą LIKE.
+"""
+import argparse
+import random
+import string
+import time
+from typing import List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.core import search
+from app.core.database import Base
+from app.crud import task as crud_task
+from app.models import task_version, user  # noqa: F401  (rejestracja modeli w metadanych)
+from app.models.task import Task
+from benchmarks.utils import format_summary, summarize
+
+
+def build_words(rng: random.Random, count: int) -> List[str]:
+    """Tworzy słownik losowych słów."""
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(count)]
+
+
+def fill(engine, tasks: int, users: int, words: List[str], rng: random.Random) -> None:
+    """Zapisuje `tasks` zadań dla każdego z `users` użytkowników."""
+    with Session(engine) as db:
+        for owner_id in range(1, users + 1):
+            db.execute(insert(Task), [
+                {
+                    "title": " ".join(rng.choices(words, k=4)),
+                    "description": " ".join(rng.choices(words, k=30)),
+                    "owner_id": owner_id,
+                }
+                for _ in range(tasks)
+            ])
+        db.commit()
+
+
+def measure(engine, queries: List[str], fts: bool) -> List[float]:
+    """Zwraca czasy wyszukiwania pierwszej strony wyników dla kolejnych zapytań."""
+    search._index_available[str(engine.url)] = fts
+    latencies = []
+    with Session(engine) as db:
+        for query in queries:
+            start = time.perf_counter()
+            crud_task.search_tasks(db, 1, query, limit=20)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--tasks", type=int, nargs="+", default=[1000, 10000, 100000],
+        help="liczby zadań na użytkownika",
+    )
+    parser.add_argument("--users", type=int, default=5, help="liczba użytkowników")
+    parser.add_argument("--queries", type=int, default=200, help="liczba zapytań w pomiarze")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = build_words(rng, 5000)
+    for count in args.tasks:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            search.create_search_index(connection)
+        fill(engine, count, args.users, words, rng)
+
+        # Zapytania jedno- i dwuwyrazowe, ostatnie słowo czasem jako niepełny prefiks
+        queries = [
+            " ".join(rng.choices(words, k=rng.randint(1, 2)))[:rng.choice([-2, None])]
+            for _ in range(args.queries)
+        ]
+        print(f"\nZadania użytkownika: {count} (łącznie {count * args.users})")
+        print("  " + format_summary("FTS5", summarize(measure(engine, queries, True))))
+        print("  " + format_summary("LIKE", summarize(measure(engine, queries, False))))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Porównanie czasu CPU na stronę listy zadań: ścieżka standardowa FastAPI
+(obiekty ORM -> modele Pydantic -> jsonable_encoder -> JSONResponse)
+oraz szybka ścieżka (krotki kolumn -> FastJSONResponse).
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_serialization --page-size 100 --pages 500
+
+Obie ścieżki pobierają te same wiersze z bazy SQLite w pamięci, a skrypt
+sprawdza, czy wynikowe bajty odpowiedzi są identyczne.
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.responses import FastJSONResponse, orjson
+from app.crud import task as crud_task
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import Task as TaskSchema
+
+
+def standard_page(db, page_size: int) -> bytes:
+    """Odtwarza serializację FastAPI dla `response_model=List[TaskSchema]`."""
+    tasks = crud_task.get_tasks(db, 1, limit=page_size)
+    models = [TaskSchema.from_orm(task) for task in tasks]
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def fast_page(db, page_size: int) -> bytes:
+    """Szybka ścieżka: krotki kolumn serializowane bez modeli Pydantic."""
+    rows = crud_task.get_task_rows(db, 1, limit=page_size)
+    return FastJSONResponse([row._asdict() for row in rows]).body
+
+
+def measure(session_factory, render: Callable, page_size: int, pages: int) -> List[float]:
+    """Zwraca czas CPU (w sekundach) każdej wygenerowanej strony."""
+    timings = []
+    for _ in range(pages):
+        with session_factory() as db:
+            start = time.process_time()
+            render(db, page_size)
+            timings.append(time.process_time() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100, help="liczba zadań na stronie")
+    parser.add_argument("--pages", type=int, default=500, help="liczba generowanych stron")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    with session_factory() as db:
+        db.add(User(id=1, email="bench@example.com", username="bench", hashed_password="x"))
+        db.add_all(
+            Task(title=f"Zadanie {i}", description="Opis zadania " * 20, owner_id=1)
+            for i in range(args.page_size)
+        )
+        db.commit()
+
+    with session_factory() as db:
+        identical = standard_page(db, args.page_size) == fast_page(db, args.page_size)
+
+    print(f"Koder szybkiej ścieżki: {'orjson' if orjson is not None else 'json'}")
+    print(f"Odpowiedzi identyczne bajtowo: {identical}")
+    for label, render in (("standardowa", standard_page), ("szybka", fast_page)):
+        timings = measure(session_factory, render, args.page_size, args.pages)
+        per_page_ms = sum(timings) / len(timings) * 1000
+        print(f"{label:<12} CPU na stronę ({args.page_size} zadań): {per_page_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Porównanie przepustowości mieszanego obciążenia (odczyt/zapis) dla SQLite
+z domyślnymi ustawieniami połączenia oraz z profilem z `Settings`.
+
+Uruchomienie (z katalogu todo_api):
+
+    python -m benchmarks.bench_sqlite_profile --threads 8 --write-ratio 0.2 --duration 5
+
+Każdy profil działa na osobnym, tymczasowym pliku bazy. Odczyt pobiera
+stronę 100 zadań użytkownika, zapis dodaje zadanie i zatwierdza transakcję.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models.task import Task
+from app.models.user import User
+from benchmarks.utils import format_summary, summarize
+
+USERS = 10
+
+
+def build_engine(profile: str, path: str):
+    """Tworzy silnik dla profilu `default` (tylko check_same_thread) lub `tuned`."""
+    uri = f"sqlite:///{path}"
+    if profile == "default":
+        return create_engine(uri, connect_args={"check_same_thread": False})
+    return create_db_engine(uri)
+
+
+def seed(session_factory, tasks_per_user: int) -> None:
+    """Wypełnia bazę użytkownikami i zadaniami."""
+    with session_factory() as db:
+        for user_id in range(1, USERS + 1):
+            db.add(User(
+                id=user_id,
+                email=f"user{user_id}@example.com",
+                username=f"user{user_id}",
+                hashed_password="x",
+            ))
+        db.flush()
+        db.add_all(
+            Task(title=f"Zadanie {i}", description="Opis zadania", owner_id=user_id)
+            for user_id in range(1, USERS + 1)
+            for i in range(tasks_per_user)
+        )
+        db.commit()
+
+
+def worker(session_factory, write_ratio: float, stop: threading.Event, results: Dict[str, List[float]]) -> None:
+    """Wykonuje losowe odczyty i zapisy aż do zatrzymania."""
+    rng = random.Random()
+    while not stop.is_set():
+        owner_id = rng.randint(1, USERS)
+        is_write = rng.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            with session_factory() as db:
+                if is_write:
+                    db.add(Task(title="Nowe zadanie", description="Opis", owner_id=owner_id))
+                    db.commit()
+                else:
+                    db.query(Task).filter(Task.owner_id == owner_id).limit(100).all()
+        except OperationalError:
+            results["errors"].append(time.perf_counter() - start)
+            continue
+        results["writes" if is_write else "reads"].append(time.perf_counter() - start)
+
+
+def run_profile(profile: str, args) -> Dict[str, List[float]]:
+    """Przeprowadza pomiar dla jednego profilu na świeżej bazie."""
+    directory = tempfile.mkdtemp(prefix="todo_bench_")
+    engine = build_engine(profile, os.path.join(directory, "bench.db"))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    seed(session_factory, args.tasks)
+
+    stop = threading.Event()
+    results: Dict[str, List[float]] = {"reads": [], "writes": [], "errors": []}
+    threads = [
+        threading.Thread(target=worker, args=(session_factory, args.write_ratio, stop, results))
+        for _ in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8, help="liczba wątków roboczych")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="udział zapisów (0-1)")
+    parser.add_argument("--duration", type=float, default=5.0, help="czas pomiaru w sekundach")
+    parser.add_argument("--tasks", type=int, default=500, help="liczba zadań na użytkownika")
+    args = parser.parse_args()
+
+    for profile in ("default", "tuned"):
+        results = run_profile(profile, args)
+        operations = len(results["reads"]) + len(results["writes"])
+        print(f"\nProfil: {profile}")
+        print(f"  przepustowość: {operations / args.duration:.1f} op/s, błędy blokady: {len(results['errors'])}")
+        print("  " + format_summary("odczyty", summarize(results["reads"])))
+        print("  " + format_summary("zapisy", summarize(results["writes"])))
+
+
+if __name__ == "__main__":
+    main()
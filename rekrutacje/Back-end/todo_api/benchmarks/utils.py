@@ -0,0 +1,95 @@
+"""Wspólne narzędzia dla skryptów pomiarowych API."""
+import contextlib
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Sequence
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def use_temporary_database() -> str:
+    """
+    Przełącza aplikację na tymczasowy plik bazy SQLite.
+
+    Musi zostać wywołana przed zaimportowaniem `app.core.database`,
+    ponieważ silnik tworzony jest podczas importu modułu.
+
+    Returns:
+        Ścieżka do pliku bazy danych.
+    """
+    fd, path = tempfile.mkstemp(prefix="todo_bench_", suffix=".db")
+    os.close(fd)
+    settings.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    return path
+
+
+def free_port() -> int:
+    """Zwraca wolny port TCP na interfejsie lokalnym."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve_in_thread(app, port: int) -> Iterator[str]:
+    """
+    Uruchamia serwer uvicorn w wątku w tle na czas trwania bloku.
+
+    Args:
+        app: Aplikacja ASGI.
+        port: Port, na którym serwer ma nasłuchiwać.
+
+    Yields:
+        Adres bazowy uruchomionego serwera.
+    """
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Zwraca percentyl `pct` (0-100) metodą najbliższej rangi."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """
+    Podsumowuje listę czasów odpowiedzi podanych w sekundach.
+
+    Returns:
+        Liczba próbek oraz średnia, p50, p95 i p99 w milisekundach.
+    """
+    return {
+        "count": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def format_summary(label: str, summary: Dict[str, float]) -> str:
+    """Formatuje podsumowanie pomiaru jako jedną linię tekstu."""
+    return (
+        f"{label:<28} n={summary['count']:<6} "
+        f"mean={summary['mean_ms']:8.2f} ms  p50={summary['p50_ms']:8.2f} ms  "
+        f"p95={summary['p95_ms']:8.2f} ms  p99={summary['p99_ms']:8.2f} ms"
+    )
@@ -1,11 +1,17 @@
+import asyncio
+import hmac
 import logging
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import metrics, profiler
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import SessionLocal, dispose_engines, init_db
+from app.core.security import shutdown_password_executor
+from app.crud.task import reconcile_task_stats
 from app.routers import auth, tasks, users
 
 # Konfiguracja loggera
@@ -16,8 +22,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Utworzenie tabel w bazie danych
-Base.metadata.create_all(bind=engine)
+# Utworzenie tabel i indeksów w bazie danych oraz uzgodnienie liczników statystyk
+# zadań (serve.py robi to raz przed startem procesów roboczych, więc nie jest
+# powtarzane w każdym z nich)
+if settings.INIT_DB_ON_STARTUP:
+    init_db()
+    with SessionLocal() as db:
+        reconcile_task_stats(db)
 
 # Utworzenie aplikacji FastAPI
 app = FastAPI(
@@ -32,14 +43,80 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-DB-Queries", "Server-Timing"],
 )
 
+# Pomiar liczby, czasu i statusów żądań dla każdej trasy
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Kompresja odpowiedzi wynegocjowana z klientem (pomija małe odpowiedzi)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+
+# Profiler SQL: liczba i czas zapytań każdego żądania (tryb diagnostyczny)
+if settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(profiler.SQLProfilerMiddleware)
+
 # Dołączenie routerów
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(users.router, prefix=settings.API_V1_STR)
 app.include_router(tasks.router, prefix=settings.API_V1_STR)
 
 
+@app.on_event("startup")
+async def startup() -> None:
+    """Uruchamia zadania w tle (opcjonalne okresowe uzgadnianie liczników statystyk zadań)."""
+    app.state.background_jobs = []
+    if settings.TASK_STATS_RECONCILE_SECONDS > 0:
+        app.state.background_jobs.append(asyncio.create_task(
+            tasks.reconcile_stats_periodically(settings.TASK_STATS_RECONCILE_SECONDS)
+        ))
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Zatrzymuje zadania w tle i zamyka pule hashowania haseł oraz połączeń z bazą danych."""
+    for job in app.state.background_jobs:
+        job.cancel()
+    await asyncio.gather(*app.state.background_jobs, return_exceptions=True)
+    shutdown_password_executor()
+    await dispose_engines()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics(request: Request) -> Response:
+    """
+    Endpoint z metrykami aplikacji w formacie tekstowym Prometheus.
+    
+    Dostęp wymaga tokenu `METRICS_TOKEN` (nagłówek Authorization: Bearer),
+    a bez skonfigurowanego tokenu jest ograniczony do klientów lokalnych.
+    Metryki dotyczą procesu roboczego, który obsłużył żądanie.
+    
+    Args:
+        request: Żądanie HTTP (nagłówek Authorization i adres klienta).
+        
+    Returns:
+        Metryki żądań HTTP, zapytań SQL, puli połączeń, hashowania haseł
+        i pamięci podręcznej tokenów.
+    """
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    if settings.METRICS_TOKEN:
+        authorization = request.headers.get("authorization", "").encode()
+        if not hmac.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}".encode()):
+            return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    elif not request.client or request.client.host not in ("127.0.0.1", "::1"):
+        return Response(status_code=403)
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/")
 def root():
     """
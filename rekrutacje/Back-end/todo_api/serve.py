@@ -0,0 +1,124 @@
+"""
+Produkcyjne uruchomienie API w kilku procesach roboczych uvicorn.
+
+Uruchomienie (z katalogu todo_api):
+
+    python serve.py --workers 4 --port 8000
+
+W odróżnieniu od `python main.py` (tryb deweloperski z przeładowaniem) serwer:
+- tworzy schemat bazy i uzgadnia liczniki statystyk zadań raz, przed startem
+  procesów roboczych; okresowe uzgadnianie (`TASK_STATS_RECONCILE_SECONDS`)
+  działa tylko w procesie nadrzędnym, a nie w każdym procesie roboczym,
+- używa uvloop i httptools, jeśli są zainstalowane (`pip install uvloop httptools`),
+- kończy pracę łagodnie: po SIGTERM/SIGINT przestaje przyjmować połączenia,
+  kończy obsługę bieżących żądań i zamyka pule połączeń oraz hashowania haseł.
+
+Domyślne wartości parametrów pochodzą z ustawień `SERVER_*`, a pozostała
+konfiguracja (klucze tokenów, baza, pule połączeń) ze zmiennych środowiskowych
+lub pliku wskazanego przez `TODO_API_CONFIG_FILE` - patrz `app/core/config.py`.
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine, init_db
+from app.crud.task import reconcile_task_stats
+from app.models import task, task_stats, task_version, user  # noqa: F401  (rejestracja modeli w metadanych)
+
+logger = logging.getLogger("serve")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=settings.SERVER_HOST, help="adres nasłuchiwania")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT, help="port")
+    parser.add_argument(
+        "--workers", type=int, default=settings.SERVER_WORKERS,
+        help="liczba procesów roboczych (0 = liczba rdzeni CPU)",
+    )
+    parser.add_argument(
+        "--keep-alive", type=int, default=settings.SERVER_KEEP_ALIVE_SECONDS,
+        help="czas utrzymywania bezczynnego połączenia (s)",
+    )
+    parser.add_argument(
+        "--backlog", type=int, default=settings.SERVER_BACKLOG,
+        help="maksymalna kolejka połączeń oczekujących",
+    )
+    parser.add_argument(
+        "--limit-concurrency", type=int, default=settings.SERVER_LIMIT_CONCURRENCY,
+        help="maksymalna liczba równoczesnych połączeń na proces (ponad limit: 503)",
+    )
+    parser.add_argument("--access-log", action="store_true", help="włącza dziennik dostępu")
+    return parser.parse_args()
+
+
+def reconcile_stats_in_background(interval: float) -> None:
+    """
+    Uruchamia okresowe uzgadnianie liczników statystyk zadań w wątku procesu nadrzędnego.
+
+    Uzgodnienie przebudowuje całą tabelę liczników, więc wykonuje je tylko
+    jeden proces, a nie każdy proces roboczy.
+    """
+    def run() -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                with SessionLocal() as db:
+                    owners = reconcile_task_stats(db)
+                logger.info("Uzgodniono liczniki zadań %d użytkowników", owners)
+            except Exception:
+                logger.exception("Uzgodnienie liczników zadań nie powiodło się")
+
+    threading.Thread(target=run, name="task-stats-reconcile", daemon=True).start()
+
+
+def main() -> None:
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
+    # Schemat i liczniki przygotowywane są raz; procesy robocze pomijają init_db
+    # przy imporcie main i nie uruchamiają własnego uzgadniania liczników
+    init_db()
+    with SessionLocal() as db:
+        reconcile_task_stats(db)
+    engine.dispose()
+    os.environ["INIT_DB_ON_STARTUP"] = "0"
+    os.environ["TASK_STATS_RECONCILE_SECONDS"] = "0"
+    reconcile_interval = settings.TASK_STATS_RECONCILE_SECONDS
+    # Przy jednym procesie roboczym uvicorn importuje main w tym procesie
+    settings.INIT_DB_ON_STARTUP = False
+    settings.TASK_STATS_RECONCILE_SECONDS = 0
+    # Wszystkie procesy robocze muszą podpisywać i weryfikować tokeny tym samym
+    # kluczem; bez konfiguracji przekazywany jest klucz losowy procesu nadrzędnego
+    os.environ.setdefault("SECRET_KEY", settings.SECRET_KEY)
+
+    logging.basicConfig(level=logging.INFO)
+    if settings.METRICS_ENABLED and workers > 1:
+        logger.warning(
+            "Metryki /metrics są liczone osobno w każdym z %d procesów roboczych; "
+            "do ich zbierania uruchom serwer z --workers 1", workers,
+        )
+    if reconcile_interval > 0:
+        reconcile_stats_in_background(reconcile_interval)
+    logger.info("Uruchamianie API: %d procesów roboczych na %s:%d", workers, args.host, args.port)
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        limit_concurrency=args.limit_concurrency,
+        access_log=args.access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -41,7 +41,9 @@ class User(UserBase):
 
 # Połączenie z bazą danych
 def get_db():
-    conn = sqlite3.connect("todo_simple.db")
+    # Zależność i endpoint mogą działać w różnych wątkach puli, a połączenie
+    # należy tylko do jednego żądania
+    conn = sqlite3.connect("todo_simple.db", check_same_thread=False)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
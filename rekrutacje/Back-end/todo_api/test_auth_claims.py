@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import TokenCache
+from app.core.config import settings
+from app.core.database import Base
+from app.core.security import ALGORITHM
+from app.models import task, task_stats, task_version  # noqa: F401  (rejestracja modeli w metadanych)
+from app.models.user import User
+from app.routers import auth
+
+
+def make_token(user_id: int, age_seconds: float) -> str:
+    """Token z danymi aktywnego użytkownika wystawiony `age_seconds` sekund temu."""
+    issued_at = int(time.time() - age_seconds)
+    claims = {"sub": "a", "uid": user_id, "act": True, "iat": issued_at, "exp": issued_at + 3600}
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Sesja z dezaktywowanym użytkownikiem 1 i pustą pamięcią podręczną tokenów."""
+    monkeypatch.setattr(auth, "token_cache", TokenCache(max_size=10, ttl_seconds=60))
+    monkeypatch.setattr(settings, "AUTH_VERIFY_USER_ON_REQUEST", False)
+    monkeypatch.setattr(settings, "AUTH_CLAIMS_MAX_AGE_SECONDS", 300)
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.add(User(id=1, email="a@example.com", username="a", hashed_password="x",
+                         is_active=False))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def current_user_id(db: Session, token: str) -> int:
+    return asyncio.run(auth.get_current_user_id(db=db, token=token))
+
+
+def test_fresh_claims_are_trusted_without_user_lookup(db):
+    assert current_user_id(db, make_token(1, age_seconds=10)) == 1
+
+
+def test_stale_claims_are_verified_in_database(db):
+    with pytest.raises(HTTPException) as error:
+        current_user_id(db, make_token(1, age_seconds=301))
+    assert error.value.detail == "Nieaktywny użytkownik"
+
+
+def test_stale_token_of_deleted_user_is_rejected(db):
+    with pytest.raises(HTTPException) as error:
+        current_user_id(db, make_token(2, age_seconds=301))
+    assert error.value.status_code == 401
@@ -0,0 +1,98 @@
+import asyncio
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE = "zadanie " * 500
+
+
+async def large(request):
+    return PlainTextResponse(LARGE)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def image(request):
+    return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(3):
+            yield LARGE
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+app = CompressionMiddleware(
+    Starlette(routes=[
+        Route("/large", large), Route("/small", small),
+        Route("/image", image), Route("/stream", stream),
+    ]),
+    minimum_size=1024,
+)
+
+
+def fetch(path: str, accept_encoding: str) -> httpx.Response:
+    async def get():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    return asyncio.run(get())
+
+
+def test_negotiate_encoding_uses_weights_then_server_preference():
+    supported = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, br", supported) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", supported) == "gzip"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0", ["gzip"]) is None
+    assert negotiate_encoding("*", supported) == "zstd"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding("", supported) is None
+
+
+def test_large_response_is_compressed_with_vary():
+    response = fetch("/large", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(LARGE)
+    assert response.text == LARGE
+
+
+def test_small_response_is_passed_through_with_vary():
+    response = fetch("/small", "gzip")
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == "ok"
+
+
+def test_response_without_accepted_encoding_still_varies():
+    response = fetch("/large", "identity")
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == LARGE
+
+
+def test_incompressible_type_is_left_alone():
+    response = fetch("/image", "gzip")
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_streamed_response_is_compressed_chunk_by_chunk():
+    response = fetch("/stream", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == LARGE * 3
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core import search
+from app.core.database import Base
+from app.crud import task as crud_task
+from app.models import task_stats, task_version, user  # noqa: F401  (rejestracja modeli w metadanych)
+from app.models.task import Task
+from app.models.task_stats import TaskStats
+from app.schemas.task import TaskCreate, TaskSort, TaskUpdate
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def db():
+    """Sesja na świeżej bazie SQLite w pamięci."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    engine.dispose()
+
+
+def test_create_tasks_with_empty_body_inserts_nothing(db):
+    assert crud_task.create_tasks(db, 1, []) == []
+    assert db.scalar(select(func.count()).select_from(Task)) == 0
+
+
+@pytest.mark.parametrize(
+    "sort, value, last_id",
+    [
+        (TaskSort.created_at, {"x": 1}, 5),
+        (TaskSort.created_at, [1, 2], 5),
+        (TaskSort.created_at, "abc", "zz"),
+        (TaskSort.created_at, None, 5),
+        (TaskSort.created_at, NOW, True),
+        (TaskSort.due_date, NOW, 5.0),
+    ],
+)
+def test_check_sort_key_rejects_wrong_types(sort, value, last_id):
+    with pytest.raises(ValueError):
+        crud_task.check_sort_key(sort, value, last_id)
+
+
+@pytest.mark.parametrize(
+    "sort, value",
+    [(TaskSort.created_at, NOW), (TaskSort.due_date, NOW), (TaskSort.due_date_desc, None)],
+)
+def test_check_sort_key_accepts_valid_position(sort, value):
+    assert crud_task.check_sort_key(sort, value, 5) == (value, 5)
+
+
+def test_update_task_adjusts_completed_counter_without_prior_select(db):
+    task = crud_task.create_task(db, 1, TaskCreate(title="a"))
+    crud_task.create_task(db, 2, TaskCreate(title="b"))
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    crud_task.update_task(db, task.id, 1, TaskUpdate(is_completed=True))
+    crud_task.update_task(db, task.id, 1, TaskUpdate(is_completed=True))
+    crud_task.update_task(db, task.id, 2, TaskUpdate(is_completed=False))
+
+    assert crud_task.get_task_stats(db, 1).completed == 1
+    assert crud_task.get_task_stats(db, 2).completed == 0
+    assert not statements[0].lstrip().upper().startswith("SELECT"), statements[0]
+
+    crud_task.update_task(db, task.id, 1, TaskUpdate(is_completed=False))
+    assert crud_task.get_task_stats(db, 1).completed == 0
+
+
+def test_counters_are_seeded_from_existing_tasks_when_row_is_missing(db):
+    # Zadania sprzed wprowadzenia liczników, bez uzgadniania przy starcie
+    db.execute(insert(Task), [
+        {"title": "a", "owner_id": 1, "is_completed": True},
+        {"title": "b", "owner_id": 1, "is_completed": False},
+    ])
+    db.commit()
+    pending = db.scalar(select(Task.id).where(Task.title == "b"))
+
+    crud_task.update_task(db, pending, 1, TaskUpdate(is_completed=True))
+    stats = crud_task.get_task_stats(db, 1)
+    assert (stats.total, stats.completed) == (2, 2)
+
+    crud_task.create_task(db, 1, TaskCreate(title="c"))
+    crud_task.delete_task(db, pending, 1)
+    stats = crud_task.get_task_stats(db, 1)
+    assert (stats.total, stats.completed) == (2, 1)
+
+
+def test_writes_that_match_no_task_leave_counters_untouched(db):
+    task = crud_task.create_task(db, 1, TaskCreate(title="a"))
+
+    assert crud_task.update_task(db, task.id, 2, TaskUpdate(is_completed=True)) is None
+    assert crud_task.update_task(db, 999, 2, TaskUpdate(is_completed=True)) is None
+    assert crud_task.delete_task(db, task.id, 2) is False
+
+    assert db.scalar(select(TaskStats).where(TaskStats.owner_id == 2)) is None
+    assert crud_task.get_task_stats(db, 1).completed == 0
+
+
+@pytest.mark.parametrize("commit", [True, False])
+def test_create_task_returns_populated_task_without_reading_it_back(db, commit):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    task = crud_task.create_task(db, 1, TaskCreate(title="a"), commit=commit)
+
+    assert task.id is not None and task.created_at is not None
+    assert task.is_completed is False
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in statements), statements
+
+
+def test_search_highlights_escape_task_text(db, monkeypatch):
+    monkeypatch.setattr(search, "_index_available", {})
+    search.create_search_index(db.connection())
+    crud_task.create_task(db, 1, TaskCreate(
+        title="<b>mleko</b> & chleb", description="kup mleko <script>alert(1)</script>"
+    ))
+
+    [result] = crud_task.search_tasks(db, 1, "mleko")
+
+    assert result["title_highlight"] == "&lt;b&gt;<mark>mleko</mark>&lt;/b&gt; &amp; chleb"
+    assert "<script>" not in result["description_snippet"]
+    assert "<mark>mleko</mark>" in result["description_snippet"]
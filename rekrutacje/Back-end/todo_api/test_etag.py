@@ -0,0 +1,13 @@
+from app.core.etag import etag_matches, make_etag
+
+ETAG = make_etag(1, 2, 3)
+
+
+def test_etag_matches_weak_comparison_in_list():
+    assert etag_matches(f'"other", {ETAG.removeprefix("W/")}', ETAG)
+    assert not etag_matches('W/"other"', ETAG)
+
+
+def test_wildcard_is_not_a_match_without_reading_the_resource():
+    assert not etag_matches("*", ETAG)
+    assert not etag_matches(" * ", ETAG)
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.core.group_commit import WriteCoordinator
+from app.crud import task as crud_task
+from app.models import task_stats, task_version, user  # noqa: F401  (rejestracja modeli w metadanych)
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    engine.dispose()
+
+
+def failing_write(db, commit: bool = True):
+    raise ValueError("boom")
+
+
+def submit_all(session_factory, writes):
+    """Zgłasza zapisy współbieżnie, więc trafiają do jednej grupy."""
+    async def run():
+        coordinator = WriteCoordinator(session_factory, window_seconds=0.01)
+        return await asyncio.gather(
+            *[coordinator.submit(fn, *args) for fn, *args in writes], return_exceptions=True
+        )
+
+    return asyncio.run(run())
+
+
+def stored_titles(session_factory):
+    with session_factory() as db:
+        return sorted(db.scalars(select(Task.title)))
+
+
+def test_failing_write_does_not_fail_the_rest_of_the_group(session_factory):
+    results = submit_all(session_factory, [
+        (crud_task.create_task, 1, TaskCreate(title="a")),
+        (failing_write,),
+        (crud_task.create_task, 1, TaskCreate(title="b")),
+    ])
+
+    assert [task.title for task in (results[0], results[2])] == ["a", "b"]
+    assert isinstance(results[1], ValueError)
+    assert stored_titles(session_factory) == ["a", "b"]
+    with session_factory() as db:
+        assert crud_task.get_task_stats(db, 1).total == 2
+
+
+def test_failed_group_commit_is_retried_write_by_write(session_factory):
+    # Zatwierdzenie nie powiedzie się, dopóki transakcja zawiera zadanie "zły"
+    @event.listens_for(session_factory, "before_commit")
+    def reject_bad_task(db):
+        if db.scalar(select(Task.id).where(Task.title == "zły")) is not None:
+            raise RuntimeError("commit rejected")
+
+    results = submit_all(session_factory, [
+        (crud_task.create_task, 1, TaskCreate(title="a")),
+        (crud_task.create_task, 1, TaskCreate(title="zły")),
+        (crud_task.create_task, 2, TaskCreate(title="b")),
+    ])
+
+    assert results[0].title == "a" and results[2].title == "b"
+    assert isinstance(results[1], RuntimeError)
+    assert stored_titles(session_factory) == ["a", "b"]
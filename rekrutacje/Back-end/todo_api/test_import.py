@@ -0,0 +1,123 @@
+import asyncio
+from typing import Dict, List
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import Base, get_session
+from app.core.importer import LINE_TOO_LONG, iter_records
+from app.crud import task as crud_task
+from app.models.task import Task
+from app.routers.auth import get_current_user_id
+from app.schemas.task import TaskFileFormat
+from main import app
+
+
+async def chunked(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def parse(file_format: TaskFileFormat, data: bytes, max_line_bytes: int = 64) -> List:
+    async def collect():
+        records = iter_records(file_format, chunked(data), max_line_bytes)
+        return [record async for record in records]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_records_report_errors_with_line_numbers():
+    too_long = b'{"title": "' + b"x" * 80 + b'"}'
+    data = b'{"title": "a"}\n\nnot json\n[1]\n' + too_long + b'\n{"title": "b"}'
+
+    records = parse(TaskFileFormat.ndjson, data)
+
+    assert records[0] == (1, {"title": "a"})
+    assert records[1][0] == 3 and records[1][1].startswith("Nieprawidłowy JSON")
+    assert records[2] == (4, "Linia musi zawierać obiekt JSON.")
+    assert records[3] == (5, LINE_TOO_LONG)
+    assert records[4] == (6, {"title": "b"})
+
+
+def test_csv_records_span_quoted_newlines_and_skip_empty_cells():
+    data = b'\xef\xbb\xbftitle,description,is_completed\r\n"a","line 1\nline 2",\r\nb,c\r\n'
+
+    records = parse(TaskFileFormat.csv, data)
+
+    assert records == [
+        (2, {"title": "a", "description": "line 1\nline 2"}),
+        (4, "Oczekiwano 3 kolumn, otrzymano 2."),
+    ]
+
+
+@pytest.fixture
+def upload(monkeypatch):
+    """Wysyła plik importu jako użytkownik 1 (baza w pamięci, porcje po 2 zadania)."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def session():
+        with Session(engine) as db:
+            yield db
+
+    app.dependency_overrides[get_session] = session
+    app.dependency_overrides[get_current_user_id] = lambda: 1
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "IMPORT_MAX_ERRORS", 2)
+
+    batches: List[int] = []
+    import_tasks = crud_task.import_tasks
+
+    def counting_import(db, owner_id, items):
+        batches.append(len(items))
+        return import_tasks(db, owner_id, items)
+
+    monkeypatch.setattr(crud_task, "import_tasks", counting_import)
+
+    def send(data: bytes) -> Dict:
+        async def post():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post(
+                    f"{settings.API_V1_STR}/tasks/import", params={"format": "ndjson"},
+                    content=chunked(data),
+                )
+
+        response = asyncio.run(post())
+        assert response.status_code == 200, response.text
+        with Session(engine) as db:
+            stored = db.scalar(select(func.count()).select_from(Task).where(Task.owner_id == 1))
+        return {"report": response.json(), "batches": batches, "stored": stored}
+
+    yield send
+    app.dependency_overrides.pop(get_session)
+    app.dependency_overrides.pop(get_current_user_id)
+    engine.dispose()
+
+
+def test_import_writes_valid_records_in_batches_and_reports_failures(upload):
+    data = b"\n".join([
+        b'{"title": "a"}',
+        b'{"title": ""}',
+        b'{"title": "b"}',
+        b'{"title": "c", "is_completed": true}',
+        b"oops",
+        b'{"description": "no title"}',
+        b'{"title": "d"}',
+    ])
+
+    result = upload(data)
+
+    report = result["report"]
+    assert (report["imported"], report["failed"]) == (4, 3)
+    # Raport obejmuje najwyżej IMPORT_MAX_ERRORS pozycji
+    assert [error["line"] for error in report["errors"]] == [2, 5]
+    assert report["errors"][0]["detail"].startswith("title:")
+    assert result["batches"] == [2, 2]
+    assert result["stored"] == 4
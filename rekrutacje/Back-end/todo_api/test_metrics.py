@@ -0,0 +1,35 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+from main import app
+
+
+def scrape(ip: str, token: Optional[str] = None) -> httpx.Response:
+    async def get():
+        transport = httpx.ASGITransport(app=app, client=(ip, 50000))
+        headers = {"Authorization": f"Bearer {token}".encode()} if token else {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/metrics", headers=headers)
+
+    return asyncio.run(get())
+
+
+def test_metrics_without_token_are_served_only_to_local_clients(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+
+    assert scrape("127.0.0.1").status_code == 200
+    assert scrape("203.0.113.7").status_code == 403
+
+
+def test_metrics_with_token_require_bearer_header(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+
+    assert scrape("127.0.0.1").status_code == 401
+    assert scrape("203.0.113.7", "wrong").status_code == 401
+    assert scrape("203.0.113.7", "żółw").status_code == 401
+    response = scrape("203.0.113.7", "s3cret")
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
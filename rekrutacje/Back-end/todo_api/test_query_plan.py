@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.database import Base
+from app.core.search import create_search_index
+from app.crud.task import build_overdue_count_query, build_search_query, build_tasks_query
+from app.models import task, task_stats, user  # noqa: F401  (rejestracja modeli w metadanych)
+from app.schemas.task import TaskFilter, TaskSort
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Silnik SQLite w pamięci z aktualnym schematem bazy."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def explain(engine, query):
+    """Zwraca plan zapytania SQLite (kolumna `detail` EXPLAIN QUERY PLAN)."""
+    compiled = query.compile(dialect=engine.dialect)
+    params = tuple(
+        str(value) if isinstance(value, datetime) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params)
+        return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        (build_tasks_query(1), "ix_tasks_owner_id_created_at_id"),
+        (build_tasks_query(1, after=(NOW, 10)), "ix_tasks_owner_id_created_at_id"),
+        (
+            build_tasks_query(1, sort=TaskSort.created_at_desc, after=(NOW, 10)),
+            "ix_tasks_owner_id_created_at_id",
+        ),
+        (
+            build_tasks_query(1, TaskFilter(created_after=NOW, created_before=NOW)),
+            "ix_tasks_owner_id_created_at_id",
+        ),
+        (build_tasks_query(1, sort=TaskSort.due_date), "ix_tasks_owner_id_due_date_id"),
+        (
+            build_tasks_query(1, TaskFilter(due_after=NOW, due_before=NOW), sort=TaskSort.due_date),
+            "ix_tasks_owner_id_due_date_id",
+        ),
+        (
+            build_tasks_query(1, TaskFilter(completed=False)),
+            "ix_tasks_owner_id_is_completed_created_at",
+        ),
+        (
+            build_tasks_query(1, TaskFilter(completed=True), sort=TaskSort.due_date_desc),
+            "ix_tasks_owner_id_is_completed_due_date",
+        ),
+        (
+            build_tasks_query(1, TaskFilter(overdue=True), sort=TaskSort.due_date),
+            "ix_tasks_owner_id_is_completed_due_date",
+        ),
+    ],
+)
+def test_task_list_queries_use_composite_indexes(engine, query, index):
+    plan = explain(engine, query.limit(100))
+
+    assert any(f"USING INDEX {index}" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+    assert not any(step.startswith("SCAN") for step in plan), plan
+
+
+def test_overdue_count_reads_only_covering_index_range(engine):
+    plan = explain(engine, build_overdue_count_query(1, NOW))
+
+    assert any(
+        "USING COVERING INDEX ix_tasks_owner_id_is_completed_due_date" in step for step in plan
+    ), plan
+
+
+def test_task_search_query_ranks_and_pages_inside_fts_index():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        assert create_search_index(conn)
+
+    plan = explain(engine, build_search_query(1, ["mleko", "chleb"]))
+
+    assert any("VIRTUAL TABLE" in step for step in plan), plan
+    assert any("INTEGER PRIMARY KEY" in step for step in plan), plan
+    assert "SCAN tasks" not in plan, plan
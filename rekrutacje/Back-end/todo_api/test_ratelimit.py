@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import Base, get_session
+from app.core.ratelimit import InMemoryRateLimitBackend, RateLimiter, RateLimitRule
+from app.routers import auth
+from main import app
+
+RULES = {"ip": RateLimitRule(100, 60), "username": RateLimitRule(2, 6)}
+
+
+def test_check_reports_first_exceeded_rule_and_wait():
+    limiter = RateLimiter(InMemoryRateLimitBackend(), RULES)
+
+    async def scenario():
+        assert await limiter.check(ip="1.1.1.1", username="a") == (None, 0.0)
+        assert await limiter.check(ip="1.1.1.1", username="a") == (None, 0.0)
+        rule, wait = await limiter.check(ip="1.1.1.1", username="a")
+        assert rule == "username" and 0 < wait <= 10
+        # Inne klucze i puste wartości nie korzystają z wyczerpanego kubełka
+        assert await limiter.check(ip="1.1.1.1", username="b") == (None, 0.0)
+        assert await limiter.check(ip="1.1.1.1", username=None) == (None, 0.0)
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def login(monkeypatch):
+    """Wysyła nieudane logowanie z podanego adresu IP (baza w pamięci, świeży ogranicznik)."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def session():
+        with Session(engine) as db:
+            yield db
+
+    app.dependency_overrides[get_session] = session
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(auth, "rate_limiter", RateLimiter(InMemoryRateLimitBackend(), RULES))
+
+    def send(ip: str) -> httpx.Response:
+        async def post():
+            transport = httpx.ASGITransport(app=app, client=(ip, 50000))
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post(
+                    f"{settings.API_V1_STR}/token", data={"username": "Victim", "password": "wrong"}
+                )
+
+        return asyncio.run(post())
+
+    yield send
+    app.dependency_overrides.pop(get_session)
+    engine.dispose()
+
+
+def test_login_returns_429_with_retry_after(login):
+    assert login("10.0.0.1").status_code == 401
+    assert login("10.0.0.1").status_code == 401
+
+    response = login("10.0.0.1")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_failed_logins_from_one_address_do_not_lock_out_others(login):
+    for _ in range(3):
+        login("10.0.0.1")
+
+    assert login("10.0.0.2").status_code == 401
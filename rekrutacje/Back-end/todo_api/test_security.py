@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core.config import CONFIG_FILE_ENV, Settings, settings
+from app.core.security import ALGORITHM, create_access_token, decode_access_token, key_id
+
+
+@pytest.fixture
+def rotate(monkeypatch):
+    """Podpisuje token kluczem "old", a następnie ustawia klucz "new" z "old" jako poprzednim."""
+    monkeypatch.setattr(settings, "SECRET_KEY", "old")
+    monkeypatch.setattr(settings, "PREVIOUS_SECRET_KEYS", [])
+    token = create_access_token({"sub": "a", "uid": 1})
+    monkeypatch.setattr(settings, "SECRET_KEY", "new")
+    monkeypatch.setattr(settings, "PREVIOUS_SECRET_KEYS", ["old"])
+    return token
+
+
+def test_token_signed_with_previous_key_is_accepted_by_kid(rotate):
+    assert jwt.get_unverified_header(rotate)["kid"] == key_id("old")
+    assert decode_access_token(rotate)["uid"] == 1
+
+    fresh = create_access_token({"sub": "a", "uid": 1})
+    assert jwt.get_unverified_header(fresh)["kid"] == key_id("new")
+    assert decode_access_token(fresh)["uid"] == 1
+
+
+def test_token_signed_with_retired_key_is_rejected(rotate, monkeypatch):
+    monkeypatch.setattr(settings, "PREVIOUS_SECRET_KEYS", [])
+
+    with pytest.raises(JWTError):
+        decode_access_token(rotate)
+
+
+def test_kid_selects_only_the_matching_key(rotate):
+    # Token podpisany bieżącym kluczem, ale z identyfikatorem poprzedniego
+    forged = jwt.encode(
+        {"sub": "a", "uid": 1}, "new", algorithm=ALGORITHM, headers={"kid": key_id("old")}
+    )
+
+    with pytest.raises(JWTError):
+        decode_access_token(forged)
+
+
+def test_token_without_kid_is_checked_against_all_keys(rotate):
+    legacy = jwt.encode({"sub": "a", "uid": 1}, "old", algorithm=ALGORITHM)
+
+    assert decode_access_token(legacy)["uid"] == 1
+
+
+def test_environment_overrides_config_file(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({
+        "SECRET_KEY": "from-file", "DB_POOL_SIZE": 7, "PREVIOUS_SECRET_KEYS": ["file-old"],
+    }))
+    monkeypatch.setenv(CONFIG_FILE_ENV, str(config_file))
+    monkeypatch.setenv("SECRET_KEY", "from-env")
+    monkeypatch.setenv("PREVIOUS_SECRET_KEYS", '["env-old"]')
+
+    loaded = Settings()
+
+    assert loaded.SECRET_KEY == "from-env"
+    assert loaded.PREVIOUS_SECRET_KEYS == ["env-old"]
+    assert loaded.DB_POOL_SIZE == 7
+    assert loaded.verification_keys == ["from-env", "env-old"]
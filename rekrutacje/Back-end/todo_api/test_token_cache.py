@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core import cache as cache_module
+from app.core.cache import TokenCache, UserSnapshot
+from app.core.database import Base
+from app.models import task, task_stats, task_version  # noqa: F401  (rejestracja modeli w metadanych)
+from app.models.user import User
+from app.routers import auth
+
+USER = UserSnapshot(id=1, email="a@example.com", username="a", is_active=True)
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Sterowany zegar modułu pamięci podręcznej."""
+    now = [NOW]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("t", {"exp": NOW + 3600}, USER)
+
+    clock[0] = NOW + 59
+    assert cache.get("t").user == USER
+    clock[0] = NOW + 60
+    assert cache.get("t") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_lifetime_is_capped_by_token_exp(clock):
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("t", {"exp": NOW + 10}, USER)
+
+    clock[0] = NOW + 10
+    assert cache.get("t") is None
+
+
+def test_oldest_entry_is_evicted_when_full(clock):
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    cache.set("a", {}, USER)
+    cache.set("b", {}, USER)
+    cache.get("a")
+    cache.set("c", {}, USER)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Sesja na bazie w pamięci i świeża pamięć podręczna tokenów modułu auth."""
+    monkeypatch.setattr(auth, "token_cache", TokenCache(max_size=10, ttl_seconds=60))
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def cache_user(db: Session) -> User:
+    user = User(email="a@example.com", username="a", hashed_password="x")
+    db.add(user)
+    db.commit()
+    auth.token_cache.set("t", {}, UserSnapshot.from_user(user))
+    auth.token_cache.set("other", {}, UserSnapshot(2, "b@example.com", "b", True))
+    return user
+
+
+def test_user_update_invalidates_cached_tokens(db):
+    user = cache_user(db)
+
+    user.is_active = False
+    db.commit()
+
+    assert auth.token_cache.get("t") is None
+    assert auth.token_cache.get("other") is not None
+
+
+def test_user_delete_invalidates_cached_tokens(db):
+    user = cache_user(db)
+
+    db.delete(user)
+    db.commit()
+
+    assert auth.token_cache.get("t") is None
+    assert auth.token_cache.get("other") is not None